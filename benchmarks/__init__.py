@@ -0,0 +1 @@
+"""Mediciones reproducibles de los caminos críticos de la aplicación."""
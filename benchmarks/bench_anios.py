@@ -0,0 +1,64 @@
+"""Compara transforms.periods_since con relativedelta fila a fila.
+
+Verifica que ambos cuentan los mismos años, semestres y trimestres completos
+(incluidos aniversarios del 29/02 y fines de mes) y mide el tiempo de cada uno.
+
+Uso: python -m benchmarks.bench_anios [--filas 200000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from transforms import PERIODOS, periods_since
+
+
+def _referencia(inicio, fin, periodo):
+    """Implementación ingenua: un relativedelta por fila."""
+    meses_periodo = PERIODOS[periodo]
+    resultado = []
+    for desde, hasta in zip(inicio, fin):
+        if hasta < desde:
+            resultado.append(-1)
+        else:
+            delta = relativedelta(hasta, desde)
+            resultado.append((delta.years * 12 + delta.months) // meses_periodo)
+    return pd.Series(resultado, index=inicio.index, dtype='float64')
+
+
+def _fechas(filas, seed=0):
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 14 * 365, filas), unit='D')
+    fin = inicio + pd.to_timedelta(rng.integers(-30, 8 * 365, filas), unit='D')
+    # Casos borde de aniversario: 29/02, 31 de mes y el día exacto
+    bordes_inicio = pd.to_datetime(['2012-02-29', '2012-02-29', '2016-01-31', '2016-01-31', '2015-06-15'])
+    bordes_fin = pd.to_datetime(['2013-02-28', '2013-03-01', '2016-02-29', '2016-04-30', '2016-06-15'])
+    inicio = pd.Series(inicio.append(bordes_inicio))
+    fin = pd.Series(fin.append(bordes_fin))
+    return inicio, fin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    inicio, fin = _fechas(args.filas)
+    print(f"{'período':<10} {'relativedelta':>14} {'vectorizado':>12} {'aceleración':>12}")
+    for periodo in PERIODOS:
+        comienzo = time.perf_counter()
+        esperado = _referencia(inicio, fin, periodo)
+        t_referencia = time.perf_counter() - comienzo
+
+        comienzo = time.perf_counter()
+        obtenido = periods_since(inicio, fin, periodo)
+        t_vectorizado = time.perf_counter() - comienzo
+
+        pd.testing.assert_series_equal(obtenido, esperado, check_names=False)
+        print(f"{periodo:<10} {t_referencia:>13.2f}s {t_vectorizado:>11.3f}s {t_referencia / t_vectorizado:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
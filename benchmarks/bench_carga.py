@@ -0,0 +1,57 @@
+"""Compara la carga secuencial de las tres hojas con load_all contra un servidor local.
+
+Uso: python -m benchmarks.bench_carga [--latencia 0.5]
+"""
+import argparse
+import time
+
+import data_loader
+from benchmarks.servidor_local import ServidorLocal
+
+PROYECTOS_CSV = b"NoProyecto,IDAreaPrioritaria,IDAreaIntervencion\nP1,A1,I1\nP2,A2,I2\n"
+OPERACIONES_CSV = (
+    b"NoProyecto,NoOperacion,IDEtapa,Alias,Pais,FechaVigencia,Estado,AporteFONPLATAVigente\n"
+    b"P1,O1,E1,Uno,ARG,01/02/2019,Vigente,1000000\n"
+    b"P2,O2,E2,Dos,BOL,15/06/2020,Vigente,2500000\n"
+)
+DESEMBOLSOS_CSV = (
+    b"IDDesembolso,IDOperacion,NoOperacion,Monto,FechaEfectiva\n"
+    b'1,E1,O1,"250.000,00",01/03/2019\n'
+    b'2,E1,O1,"500.000,50",01/04/2020\n'
+    b'3,E2,O2,"1.000.000,00",20/07/2021\n'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latencia", type=float, default=0.5, help="segundos por respuesta")
+    args = parser.parse_args()
+
+    archivos = {
+        "/proyectos.csv": PROYECTOS_CSV,
+        "/operaciones.csv": OPERACIONES_CSV,
+        "/desembolsos.csv": DESEMBOLSOS_CSV,
+    }
+    with ServidorLocal(archivos, latencia=args.latencia) as servidor:
+        urls = {nombre: servidor.url(f"/{nombre}.csv") for nombre in ("proyectos", "operaciones", "desembolsos")}
+
+        data_loader.invalidate()
+        inicio = time.perf_counter()
+        for url in urls.values():
+            data_loader.load_data(url)
+        secuencial = time.perf_counter() - inicio
+
+        data_loader.invalidate()
+        inicio = time.perf_counter()
+        hojas = data_loader.load_all(urls)
+        paralelo = time.perf_counter() - inicio
+
+    print(f"latencia por hoja: {args.latencia:.3f}s")
+    print(f"secuencial: {secuencial:.3f}s")
+    print(f"load_all:   {paralelo:.3f}s")
+    for nombre, segundos in hojas.tiempos.items():
+        print(f"  {nombre}: {segundos:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compara memoria y tiempo de lectura sin esquema contra schema.read_table.
+
+Uso: python -m benchmarks.bench_esquema [--desembolsos 100000]
+"""
+import argparse
+import io
+import time
+
+import pandas as pd
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from schema import read_table
+
+
+def _mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--desembolsos", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tablas = dict(zip(("proyectos", "operaciones", "desembolsos"), generar_portafolio(args.desembolsos)))
+    print(f"{'hoja':<12} {'sin esquema':>14} {'con esquema':>14} {'ahorro':>8} {'t sin':>8} {'t con':>8}")
+    for nombre, df in tablas.items():
+        contenido = a_csv(df)
+
+        inicio = time.perf_counter()
+        crudo = pd.read_csv(io.BytesIO(contenido))
+        t_crudo = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        tipado = read_table(contenido, nombre)
+        t_tipado = time.perf_counter() - inicio
+
+        # Sin esquema las páginas además convierten montos y fechas: solo se mide la lectura
+        ahorro = 1 - _mb(tipado) / _mb(crudo)
+        print(
+            f"{nombre:<12} {_mb(crudo):>11.1f} MB {_mb(tipado):>11.1f} MB {ahorro:>7.0%} "
+            f"{t_crudo:>7.2f}s {t_tipado:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compara la exportación anterior a Excel con export.py en una tabla de 500k filas.
+
+Para cada camino mide tiempo, pico de memoria (tracemalloc) y tamaño del
+archivo; la segunda llamada a export_bytes muestra el costo con la caché.
+El tiempo y la memoria se miden en pasadas separadas, porque tracemalloc
+hace más lenta cada asignación.
+
+Uso: python -m benchmarks.bench_exportacion [--filas 500000]
+"""
+import argparse
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+
+import export
+from benchmarks.sintetico import a_csv, generar_portafolio
+from fact_table import add_years, build_fact_table
+from schema import read_table
+
+
+def _excel_openpyxl(df):
+    """El dataframe_to_excel_bytes que tenían las páginas."""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Resultados', index=False)
+    return output.getvalue()
+
+
+def _vaciar_cache():
+    export._archivos.clear()
+    export._huellas.clear()
+
+
+def _medir(funcion, desde_cero):
+    """(segundos, pico de memoria, tamaño); con ``desde_cero`` cada pasada empieza sin la caché de export."""
+    if desde_cero:
+        _vaciar_cache()
+    inicio = time.perf_counter()
+    contenido = funcion()
+    segundos = time.perf_counter() - inicio
+
+    if desde_cero:
+        _vaciar_cache()
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico, len(contenido)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=500_000)
+    args = parser.parse_args()
+
+    proyectos, operaciones, desembolsos = (
+        read_table(a_csv(df), nombre)
+        for df, nombre in zip(generar_portafolio(args.filas), ("proyectos", "operaciones", "desembolsos"))
+    )
+    df = add_years(build_fact_table(proyectos, operaciones, desembolsos, how='left'))
+    print(f"filas: {len(df):,}  columnas: {len(df.columns)}  en memoria: {df.memory_usage(deep=True).sum() / 1e6:.0f} MB")
+
+    # nombre -> (función, si cada pasada empieza sin la caché)
+    caminos = {
+        'xlsx pandas+openpyxl': (lambda: _excel_openpyxl(df), True),
+        'xlsx export': (lambda: export.export_bytes(df, 'xlsx'), True),
+        'xlsx export (caché)': (lambda: export.export_bytes(df, 'xlsx'), False),
+        'csv export': (lambda: export.export_bytes(df, 'csv'), True),
+        'parquet export': (lambda: export.export_bytes(df, 'parquet'), True),
+    }
+    print(f"{'':<22} {'tiempo':>9} {'pico memoria':>13} {'archivo':>10}")
+    for nombre, (funcion, desde_cero) in caminos.items():
+        segundos, pico, tamano = _medir(funcion, desde_cero)
+        print(f"{nombre:<22} {segundos:>8.2f}s {pico / 1e6:>10.0f} MB {tamano / 1e6:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
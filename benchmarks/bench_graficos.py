@@ -0,0 +1,84 @@
+"""Compara los seis gráficos separados de las páginas de curvas con curve_chart.
+
+Mide el tamaño de las especificaciones Vega-Lite (lo que viaja al navegador)
+y el tiempo de construirlas, sin caché y con curve_chart_spec memorizado.
+
+Uso: python -m benchmarks.bench_graficos [--desembolsos 100000] [--repeticiones 20]
+"""
+import argparse
+import json
+import time
+
+import altair as alt
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from charts import curve_chart, curve_chart_spec
+from curves import compute_curves
+from fact_table import add_years, build_fact_table
+from schema import read_table
+
+EJES = {'Ano': 'Año', 'Ano_FechaEfectiva': 'Año de Fecha Efectiva'}
+
+
+def _grafico_separado(data, x_col, y_col, title, color):
+    """El line_chart_with_labels que tenía cada página: una línea y sus etiquetas."""
+    chart = alt.Chart(data).mark_line(point=True, color=color).encode(
+        x=alt.X(f'{x_col}:O', axis=alt.Axis(title='Año', labelAngle=0)),
+        y=alt.Y(f'{y_col}:Q', axis=alt.Axis(title=y_col)),
+        tooltip=[x_col, y_col]
+    ).properties(title=title, width=600, height=400)
+    text = chart.mark_text(align='left', baseline='middle', dx=18, dy=-18).encode(
+        text=alt.Text(f'{y_col}:Q', format='.2f')
+    )
+    return chart + text
+
+
+def _separados(curvas):
+    specs = []
+    for eje, curva in curvas.items():
+        for serie, color in (('Monto', 'steelblue'), ('Monto Acumulado', 'goldenrod'), ('Porcentaje Acumulado', 'salmon')):
+            specs.append(_grafico_separado(curva, eje, serie, f'{serie} por {EJES[eje]}', color).to_dict())
+    return specs
+
+
+def _consolidados(curvas, constructor):
+    return [constructor(curva, eje, f'Curva por {EJES[eje]}') for eje, curva in curvas.items()]
+
+
+def _medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        specs = funcion()
+    return specs, (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--desembolsos", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    proyectos, operaciones, desembolsos = (
+        read_table(a_csv(df), nombre)
+        for df, nombre in zip(generar_portafolio(args.desembolsos), ("proyectos", "operaciones", "desembolsos"))
+    )
+    hechos = add_years(build_fact_table(proyectos, operaciones, desembolsos))
+    # La curva de un país, con todas sus columnas como la reciben las páginas
+    curvas = {}
+    for eje in EJES:
+        todas = compute_curves(hechos, 'Pais', eje)
+        curvas[eje] = todas[todas['Pais'] == todas['Pais'].iloc[0]].reset_index(drop=True)
+
+    resultados = {
+        'seis gráficos': _medir(lambda: _separados(curvas), args.repeticiones),
+        'curve_chart': _medir(lambda: _consolidados(curvas, lambda *a: curve_chart(*a).to_dict()), args.repeticiones),
+        'curve_chart_spec': _medir(lambda: _consolidados(curvas, curve_chart_spec), args.repeticiones),
+    }
+    print(f"{'':<18} {'specs':>6} {'bytes':>10} {'tiempo por rerun':>17}")
+    for nombre, (specs, segundos) in resultados.items():
+        tamano = sum(len(json.dumps(spec)) for spec in specs)
+        print(f"{nombre:<18} {len(specs):>6} {tamano:>10,} {segundos * 1000:>15.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
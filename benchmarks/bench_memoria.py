@@ -0,0 +1,136 @@
+"""Pico de memoria (RSS) del pipeline por cada millón de desembolsos.
+
+Para cada tamaño guarda un portafolio sintético ya limpio como instantánea y
+mide, en un proceso nuevo, la memoria al abrir la instantánea y después de cada etapa que
+precalcula refresh.warm: tablas de hechos, cubos y curvas, ejecución y
+pivotes por país. Con ``--sin-cow`` se mide lo mismo sin copy-on-write para
+comparar (solo con pandas < 3).
+
+Uso: python -m benchmarks.bench_memoria [--desembolsos 1000000 ...] [--sin-cow]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from data_loader import Hojas
+from schema import read_table
+from snapshot import TABLAS, save_snapshot
+
+
+def _reiniciar_pico():
+    """Reinicia el pico de RSS del proceso (VmHWM); solo en Linux."""
+    try:
+        with open("/proc/self/clear_refs", "w") as archivo:
+            archivo.write("5")
+    except OSError:
+        pass
+
+
+def _pico_mb():
+    # VmHWM es el pico del propio proceso; ru_maxrss conserva el del padre a través de fork+exec
+    try:
+        with open("/proc/self/status") as archivo:
+            for linea in archivo:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) * 1024 / 1e6
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KiB; macOS, bytes
+    return pico / 1e6 if sys.platform == "darwin" else pico * 1024 / 1e6
+
+
+def _actual_mb():
+    """RSS actual (lo que queda retenido, p. ej. en las cachés); None fuera de Linux."""
+    try:
+        with open("/proc/self/statm") as archivo:
+            paginas = int(archivo.read().split()[1])
+    except OSError:
+        return None
+    return paginas * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def _medir(directorio, sin_cow):
+    """Proceso hijo: etapas del pipeline sobre la instantánea de ``directorio``."""
+    import pandas as pd
+
+    import caching  # noqa: F401  (activa copy-on-write)
+    from curves import curves
+    from execution import execution
+    from fact_table import filtered_facts
+    from pivots import country_pivots
+    from refresh import CURVAS_PAGINAS
+    from snapshot import load_snapshot
+
+    if sin_cow:
+        pd.set_option('mode.copy_on_write', False)
+
+    _reiniciar_pico()
+    etapas = [('inicio', _pico_mb(), _actual_mb())]
+
+    def registrar(etapa):
+        etapas.append((etapa, _pico_mb(), _actual_mb()))
+
+    hojas = load_snapshot(directorio)
+    registrar('carga instantánea')
+    for union, how in [('IDOperacion', 'inner'), ('NoOperacion', 'left')]:
+        filtered_facts(hojas, union, how=how)
+    registrar('tablas de hechos')
+    for clave, union, how in CURVAS_PAGINAS:
+        for eje in ('Ano', 'Ano_FechaEfectiva'):
+            curves(hojas, clave, eje, union, how=how)
+    registrar('cubos y curvas')
+    execution(hojas)
+    registrar('ejecución')
+    country_pivots(hojas)
+    registrar('pivotes por país')
+    print(json.dumps(etapas))
+
+
+def _preparar(desembolsos, directorio):
+    tablas = {
+        nombre: read_table(a_csv(df), nombre)
+        for df, nombre in zip(generar_portafolio(desembolsos), TABLAS)
+    }
+    save_snapshot(Hojas(tiempos={}, **tablas), directorio)
+
+
+def _ejecutar(desembolsos, sin_cow):
+    with tempfile.TemporaryDirectory() as directorio:
+        _preparar(desembolsos, directorio)
+        comando = [sys.executable, "-m", "benchmarks.bench_memoria", "--medir", directorio]
+        if sin_cow:
+            comando.append("--sin-cow")
+        salida = subprocess.run(comando, capture_output=True, text=True, check=True).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--desembolsos", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--sin-cow", action="store_true", help="desactiva copy-on-write (pandas < 3)")
+    parser.add_argument("--medir", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        _medir(args.medir, args.sin_cow)
+        return
+
+    for desembolsos in args.desembolsos:
+        etapas = _ejecutar(desembolsos, args.sin_cow)
+        base = etapas[0][1]
+        millones = desembolsos / 1e6
+        print(f"{desembolsos:,} desembolsos{' (sin copy-on-write)' if args.sin_cow else ''}:")
+        print(f"  {'etapa':<20} {'pico MB':>9} {'actual MB':>10} {'pico/1M':>9}")
+        for etapa, pico, actual in etapas[1:]:
+            retenido = f"{actual:>10.0f}" if actual is not None else f"{'-':>10}"
+            print(f"  {etapa:<20} {pico:>9.0f} {retenido} {(pico - base) / millones:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
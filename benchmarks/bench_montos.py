@@ -0,0 +1,55 @@
+"""Compara parse_amounts con convert_to_float fila a fila sobre montos sintéticos.
+
+Uso: python -m benchmarks.bench_montos [--filas 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from transforms import convert_to_float, parse_amounts
+
+_A_ESPANOL = str.maketrans(",.", ".,")
+
+
+def montos_sinteticos(filas, seed=0, invalidos=True):
+    """Montos con formato "1.234.567,89" y, con ``invalidos``, un 0,1 % de valores inválidos.
+
+    La columna tiene el dtype de texto que deja read_csv con ``dtype=str``,
+    como la que recibe parse_amounts en schema.read_table.
+    """
+    rng = np.random.default_rng(seed)
+    valores = rng.uniform(0, 5_000_000, filas).round(2)
+    montos = [f"{valor:,.2f}".translate(_A_ESPANOL) for valor in valores]
+    if invalidos:
+        for posicion in rng.choice(filas, size=max(filas // 1000, 1), replace=False):
+            montos[posicion] = "s/d"
+    return pd.Series(montos, dtype=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"filas: {args.filas:,}")
+    for nombre, invalidos in (("con 0,1 % inválidos", True), ("sin inválidos", False)):
+        montos = montos_sinteticos(args.filas, invalidos=invalidos)
+
+        inicio = time.perf_counter()
+        esperado = montos.apply(convert_to_float)
+        t_fila = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultado, fallidos = parse_amounts(montos, return_failures=True)
+        t_vector = time.perf_counter() - inicio
+
+        pd.testing.assert_series_equal(resultado, esperado, check_exact=True)
+        print(f"{nombre}:")
+        print(f"  convert_to_float (apply): {t_fila:.3f}s")
+        print(f"  parse_amounts:            {t_vector:.3f}s  ({t_fila / t_vector:.1f}x)")
+        print(f"  filas sin convertir: {len(fallidos):,} (resultados idénticos)")
+
+if __name__ == "__main__":
+    main()
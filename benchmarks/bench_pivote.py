@@ -0,0 +1,72 @@
+"""Compara el pivote denso IDEtapa × Ano con el pivote en formato largo.
+
+Mide memoria, tiempo de construcción y el costo de serializar a Arrow (lo que
+hace st.dataframe) la grilla completa frente a la ventana visible.
+
+Uso: python -m benchmarks.bench_pivote [--desembolsos 1000000] [--ventana 50]
+"""
+import argparse
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from fact_table import build_fact_table
+from pivots import densify, long_cells, sparse_pivot, year_rows
+from schema import read_table
+
+
+def _mb(*objetos):
+    # memory_usage devuelve una Serie para DataFrame y un entero para Serie
+    return sum(pd.Series(objeto.memory_usage(deep=True)).sum() for objeto in objetos) / 1e6
+
+
+def _serializar(df):
+    """Bytes y segundos de convertir ``df`` a un stream Arrow IPC."""
+    inicio = time.perf_counter()
+    tabla = pa.Table.from_pandas(df)
+    sumidero = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sumidero, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return sumidero.getvalue().size, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--desembolsos", type=int, default=1_000_000)
+    parser.add_argument("--ventana", type=int, default=50)
+    args = parser.parse_args()
+
+    proyectos, operaciones, desembolsos = (
+        read_table(a_csv(df), nombre)
+        for df, nombre in zip(generar_portafolio(args.desembolsos), ("proyectos", "operaciones", "desembolsos"))
+    )
+    filas = year_rows(build_fact_table(proyectos, operaciones, desembolsos, 'IDOperacion', how='left'))
+
+    inicio = time.perf_counter()
+    denso = pd.pivot_table(filas, values='Monto', index='IDEtapa', columns='Ano', aggfunc='sum', fill_value=0)
+    denso['Total'] = denso.sum(axis=1)
+    t_denso = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    pivote = sparse_pivot(long_cells(filas, 'Monto'))
+    ventana = densify(pivote, 0, args.ventana)
+    t_largo = time.perf_counter() - inicio
+
+    pd.testing.assert_frame_equal(densify(pivote), denso, check_exact=False, check_column_type=False)
+
+    celdas = denso.shape[0] * (denso.shape[1] - 1)
+    print(f"IDEtapa: {denso.shape[0]:,}  años: {denso.shape[1] - 1}  celdas con datos: {len(pivote.celdas):,} de {celdas:,}")
+    print(f"{'':<18} {'memoria':>10} {'construcción':>13} {'Arrow':>10} {'serializar':>11}")
+    bytes_denso, t_ser_denso = _serializar(denso)
+    bytes_ventana, t_ser_ventana = _serializar(ventana)
+    print(f"{'denso completo':<18} {_mb(denso):>7.1f} MB {t_denso:>12.3f}s {bytes_denso / 1e6:>7.2f} MB {t_ser_denso:>10.4f}s")
+    print(
+        f"{'largo + ventana':<18} {_mb(pivote.celdas, pivote.totales):>7.1f} MB {t_largo:>12.3f}s "
+        f"{bytes_ventana / 1e6:>7.2f} MB {t_ser_ventana:>10.4f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Cuenta y cronometra las reejecuciones de una página al cambiar su selectbox.
+
+Ejecuta la página con streamlit.testing (AppTest) sobre una instantánea de un
+portafolio sintético, cambia la selección varias veces y cuenta cuántas veces
+se volvieron a cargar las hojas y a dibujar gráficos y tablas, con y sin
+st.fragment. AppTest siempre vuelve a ejecutar el script entero, así que el
+rerun de un fragmento se reproduce ejecutando solo ``show_selection`` (con
+los argumentos de la última ejecución completa), que es lo que hace
+Streamlit al cambiar un widget dentro del fragmento. Se mide el tiempo del
+script por rerun, con los gráficos ya en caché (después de una primera
+pasada por las mismas selecciones).
+
+Uso: python -m benchmarks.bench_reruns [--pagina pages/1_CurvaProyectos.py] [--cambios 10]
+"""
+import argparse
+import os
+import tempfile
+from collections import Counter
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+import refresh
+import snapshot
+from benchmarks.sintetico import a_csv, generar_portafolio
+from data_loader import Hojas
+from schema import read_table
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_llamadas = Counter()
+
+
+def _contar(nombre, funcion):
+    def envoltura(*args, **kwargs):
+        _llamadas[nombre] += 1
+        return funcion(*args, **kwargs)
+    return envoltura
+
+
+def _script(ruta):
+    """La página bajo AppTest; con ``solo_fragmento`` en session_state solo se ejecuta show_selection."""
+    import importlib.util
+    import time
+
+    import streamlit as st
+
+    inicio = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("pagina_medida", ruta)
+    pagina = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pagina)
+    if st.session_state.get("solo_fragmento"):
+        pagina.show_selection(*st.session_state["argumentos"])
+    else:
+        show_selection = pagina.show_selection
+
+        def capturar(*args):
+            st.session_state["argumentos"] = args
+            return show_selection(*args)
+
+        pagina.show_selection = capturar
+        pagina.run()
+    # Tiempo del script, sin la espera de AppTest por los widgets que un rerun del fragmento no dibuja
+    st.session_state.setdefault("segundos", []).append(time.perf_counter() - inicio)
+
+
+def _medir(ruta, cambios, solo_fragmento):
+    """Ejecuta la página, cambia la selección ``cambios`` veces y devuelve (llamadas, segundos por rerun)."""
+    app = AppTest.from_function(_script, args=(ruta,), default_timeout=120)
+    app.run()
+    app.session_state["solo_fragmento"] = solo_fragmento
+    # Una primera pasada por las mismas selecciones deja los gráficos en caché en ambas mediciones
+    _cambiar(app, cambios)
+    app.session_state["segundos"] = []
+    _llamadas.clear()
+    _cambiar(app, cambios)
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    segundos = app.session_state["segundos"]
+    return dict(_llamadas), sum(segundos) / len(segundos)
+
+
+def _cambiar(app, cambios):
+    for cambio in range(cambios):
+        # El selectbox de la página ("Select ... to filter"), no los de la tabla o las descargas
+        selector = next(selector for selector in app.selectbox if selector.label.startswith("Select "))
+        # Las opciones se ven con format_func ("IDEtapa (Alias)"); el valor es lo anterior al primer espacio
+        opcion = selector.options[(cambio + 1) % len(selector.options)]
+        selector.set_value(opcion.split(' ')[0] if ' (' in opcion else opcion).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pagina", default="pages/1_CurvaProyectos.py", help="ruta relativa a la raíz del repositorio")
+    parser.add_argument("--cambios", type=int, default=10)
+    parser.add_argument("--desembolsos", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tablas = {
+        nombre: read_table(a_csv(df), nombre)
+        for df, nombre in zip(generar_portafolio(args.desembolsos), ("proyectos", "operaciones", "desembolsos"))
+    }
+    directorio = tempfile.mkdtemp(prefix="bench_reruns_")
+    snapshot.save_snapshot(Hojas(tiempos={}, **tablas), directorio)
+    snapshot.SNAPSHOT_DIR = directorio
+
+    # Las páginas resuelven estos nombres al ejecutarse, así que ven las versiones que cuentan
+    refresh.current = _contar("carga", refresh.current)
+    streamlit.vega_lite_chart = _contar("vega_lite_chart", streamlit.vega_lite_chart)
+    streamlit.write = _contar("write", streamlit.write)
+    streamlit.dataframe = _contar("dataframe", streamlit.dataframe)
+
+    ruta = os.path.join(RAIZ, args.pagina)
+    sin_fragmentos = _medir(ruta, args.cambios, solo_fragmento=False)
+    con_fragmentos = _medir(ruta, args.cambios, solo_fragmento=True)
+
+    print(f"{args.pagina}: {args.cambios} cambios de selección")
+    print(f"{'':<16} {'carga':>6} {'vega_lite_chart':>16} {'write':>7} {'dataframe':>10} {'por rerun':>10}")
+    for nombre, (llamadas, segundos) in (("sin fragmentos", sin_fragmentos), ("con fragmentos", con_fragmentos)):
+        print(
+            f"{nombre:<16} {llamadas.get('carga', 0):>6} {llamadas.get('vega_lite_chart', 0):>16} "
+            f"{llamadas.get('write', 0):>7} {llamadas.get('dataframe', 0):>10} {segundos * 1000:>7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
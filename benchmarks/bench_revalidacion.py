@@ -0,0 +1,45 @@
+"""Muestra la revalidación condicional del cargador contra un servidor local.
+
+Recorre tres escenarios: 304 con ETag, contenido cambiado (200) y servidor
+sin validadores, donde se compara el hash del contenido.
+
+Uso: python -m benchmarks.bench_revalidacion
+"""
+import time
+
+import data_loader
+from benchmarks.bench_carga import DESEMBOLSOS_CSV
+from benchmarks.servidor_local import ServidorLocal
+
+RUTA = "/desembolsos.csv"
+
+
+def _cargar(url):
+    inicio = time.perf_counter()
+    # ttl=0 obliga a revalidar en cada llamada
+    df = data_loader.load_data(url, ttl=0)
+    return df, time.perf_counter() - inicio
+
+
+def escenario(nombre, validadores, cambiar_contenido):
+    with ServidorLocal({RUTA: DESEMBOLSOS_CSV}, validadores=validadores) as servidor:
+        url = servidor.url(RUTA)
+        data_loader.invalidate()
+        primero, t_inicial = _cargar(url)
+        if cambiar_contenido:
+            servidor.actualizar(RUTA, DESEMBOLSOS_CSV + b'4,E2,O2,"10,00",01/01/2022\n')
+        segundo, t_revalidado = _cargar(url)
+        print(
+            f"{nombre}: inicial {t_inicial * 1000:.1f}ms, revalidación {t_revalidado * 1000:.1f}ms, "
+            f"respuestas {servidor.respuestas}, DataFrame reutilizado: {segundo is primero}"
+        )
+
+
+def main():
+    escenario("ETag sin cambios", validadores=True, cambiar_contenido=False)
+    escenario("ETag con cambios", validadores=True, cambiar_contenido=True)
+    escenario("sin validadores", validadores=False, cambiar_contenido=False)
+
+
+if __name__ == "__main__":
+    main()
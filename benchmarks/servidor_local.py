@@ -0,0 +1,85 @@
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ServidorLocal:
+    """Servidor HTTP local que sirve CSV de prueba con una latencia inyectada.
+
+    Sustituye a las hojas publicadas de Google Sheets en las mediciones:
+    ``archivos`` asocia una ruta (por ejemplo ``/proyectos.csv``) con su contenido.
+    Con ``validadores`` envía ETag y Last-Modified y responde 304 a las
+    peticiones condicionales cuyo contenido no cambió.
+    """
+
+    def __init__(self, archivos, latencia=0.0, validadores=True):
+        self.latencia = latencia
+        self.validadores = validadores
+        self.respuestas = {200: 0, 304: 0}
+        self._archivos = {}
+        self._lock = threading.Lock()
+        for ruta, contenido in archivos.items():
+            self.actualizar(ruta, contenido)
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+
+    @property
+    def peticiones(self):
+        return sum(self.respuestas.values())
+
+    def actualizar(self, ruta, contenido):
+        """Publica un contenido nuevo en la ruta, con validadores nuevos."""
+        etag = '"%s"' % hashlib.sha1(contenido).hexdigest()
+        with self._lock:
+            self._archivos[ruta] = (contenido, etag, formatdate(time.time(), usegmt=True))
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(servidor.latencia)
+                with servidor._lock:
+                    archivo = servidor._archivos.get(self.path)
+                if archivo is None:
+                    self.send_error(404)
+                    return
+                contenido, etag, last_modified = archivo
+
+                if servidor.validadores and self.headers.get("If-None-Match") == etag:
+                    with servidor._lock:
+                        servidor.respuestas[304] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                with servidor._lock:
+                    servidor.respuestas[200] += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(len(contenido)))
+                if servidor.validadores:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(contenido)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def url(self, ruta):
+        host, puerto = self._servidor.server_address
+        return f"http://{host}:{puerto}{ruta}"
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
@@ -0,0 +1,68 @@
+"""Generador de un portafolio sintético con la forma de las hojas publicadas.
+
+Produce proyectos, operaciones y desembolsos con los mismos nombres de
+columna que las hojas reales, fechas como "dd/mm/aaaa" y montos como texto
+con formato "1.234.567,89". Incluye columnas que las páginas no usan, como
+las hojas reales.
+"""
+import numpy as np
+import pandas as pd
+
+PAISES = ['ARG', 'BOL', 'BRA', 'PAR', 'URU']
+ESTADOS = ['Vigente', 'Finalizada', 'Cancelada', 'En Ejecución']
+_A_ESPANOL = str.maketrans(',.', '.,')
+
+
+def formato_espanol(valores):
+    """Montos como texto "1.234.567,89"."""
+    return [f"{valor:,.2f}".translate(_A_ESPANOL) for valor in valores]
+
+
+def _fechas_texto(fechas):
+    return pd.Series(fechas).dt.strftime('%d/%m/%Y').to_numpy()
+
+
+def generar_portafolio(desembolsos, seed=0):
+    """Devuelve (proyectos, operaciones, desembolsos) como DataFrames de texto."""
+    rng = np.random.default_rng(seed)
+    n_operaciones = max(desembolsos // 40, 10)
+    n_proyectos = max(n_operaciones // 2, 5)
+
+    proyectos = pd.DataFrame({
+        'NoProyecto': [f"PRY-{i:06d}" for i in range(n_proyectos)],
+        'NombreProyecto': [f"Proyecto {i}" for i in range(n_proyectos)],
+        'IDAreaPrioritaria': rng.choice([f"AP{i}" for i in range(1, 7)], n_proyectos),
+        'IDAreaIntervencion': rng.choice([f"AI{i:02d}" for i in range(1, 21)], n_proyectos),
+        'Descripcion': 'Proyecto sintético para mediciones de rendimiento',
+    })
+
+    vigencias = pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 14 * 365, n_operaciones), unit='D')
+    paises = rng.choice(PAISES, n_operaciones)
+    operaciones = pd.DataFrame({
+        'NoProyecto': rng.choice(proyectos['NoProyecto'].to_numpy(), n_operaciones),
+        'NoOperacion': [f"{pais}-{i:06d}" for i, pais in enumerate(paises)],
+        'IDEtapa': [str(100000 + i) for i in range(n_operaciones)],
+        'Alias': [f"OP{i}" for i in range(n_operaciones)],
+        'Pais': paises,
+        'FechaVigencia': _fechas_texto(vigencias),
+        'Estado': rng.choice(ESTADOS, n_operaciones),
+        'AporteFONPLATAVigente': rng.uniform(1e6, 80e6, n_operaciones).round(2),
+        'Observaciones': '',
+    })
+
+    operacion = rng.integers(0, n_operaciones, desembolsos)
+    efectivas = vigencias[operacion] + pd.to_timedelta(rng.integers(-30, 8 * 365, desembolsos), unit='D')
+    desembolsos_df = pd.DataFrame({
+        'IDDesembolso': np.arange(1, desembolsos + 1).astype(str),
+        'IDOperacion': operaciones['IDEtapa'].to_numpy()[operacion],
+        'NoOperacion': operaciones['NoOperacion'].to_numpy()[operacion],
+        'Monto': formato_espanol(rng.uniform(1e3, 5e6, desembolsos).round(2)),
+        'FechaEfectiva': _fechas_texto(efectivas),
+        'Moneda': 'USD',
+    })
+    return proyectos, operaciones, desembolsos_df
+
+
+def a_csv(df):
+    """Serializa como lo publica Google Sheets."""
+    return df.to_csv(index=False).encode('utf-8')
@@ -0,0 +1,166 @@
+"""Suite de tiempos de los caminos críticos sobre portafolios sintéticos.
+
+Para cada tamaño genera proyectos, operaciones y desembolsos con
+sintetico.generar_portafolio y mide cada etapa: conversión de montos, parseo
+de fechas, uniones, el cálculo de cada página, las tablas pivote y la
+construcción de gráficos. Los resultados se guardan en JSON junto con el
+commit, para comparar ejecuciones entre commits con ``--comparar``.
+
+Uso: python -m benchmarks.suite [--tamanos 10k 100k 1M 10M] [--salida archivo.json] [--comparar anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import pandas as pd
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from charts import curve_chart
+from cube import build_cube
+from curves import compute_curves
+from fact_table import add_years, build_fact_table
+from pivots import long_cells, sparse_pivot, year_rows
+from schema import parse_dates, read_table
+from transforms import convert_to_float, parse_amounts
+
+TAMANOS = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000, '10M': 10_000_000}
+# La referencia fila a fila de convert_to_float solo se mide hasta este tamaño
+MAX_FILAS_REFERENCIA = 1_000_000
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+# Clave y variante de unión de las curvas de cada página
+PAGINAS = {
+    '1_CurvaProyectos': ('IDEtapa', 'IDOperacion', 'inner'),
+    '2_CurvaSectores': ('IDAreaPrioritaria', 'IDOperacion', 'inner'),
+    '4_CurvaSubSectores': ('IDAreaIntervencion', 'NoOperacion', 'left'),
+    '6_CurvaPaises': ('Pais', 'IDOperacion', 'inner'),
+}
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _cronometrar(tiempos, etapa, funcion, repeticiones):
+    """Mejor tiempo de ``repeticiones`` ejecuciones; devuelve el resultado de la última."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    tiempos[etapa] = mejor
+    return resultado
+
+
+def run_size(desembolsos, repeticiones=1):
+    """Tiempos en segundos de cada etapa para un portafolio de ``desembolsos`` filas."""
+    crudas = dict(zip(("proyectos", "operaciones", "desembolsos"), generar_portafolio(desembolsos)))
+    contenidos = {nombre: a_csv(df) for nombre, df in crudas.items()}
+    montos = crudas['desembolsos']['Monto']
+    tiempos = {}
+
+    if desembolsos <= MAX_FILAS_REFERENCIA:
+        _cronometrar(tiempos, 'montos convert_to_float', lambda: montos.apply(convert_to_float), repeticiones)
+    _cronometrar(tiempos, 'montos parse_amounts', lambda: parse_amounts(montos), repeticiones)
+    _cronometrar(tiempos, 'fechas parse_dates', lambda: parse_dates(crudas['desembolsos']['FechaEfectiva']), repeticiones)
+    tablas = {
+        nombre: _cronometrar(tiempos, f'lectura {nombre}', lambda nombre=nombre: read_table(contenidos[nombre], nombre), repeticiones)
+        for nombre in contenidos
+    }
+    proyectos, operaciones, desembolsos_df = tablas['proyectos'], tablas['operaciones'], tablas['desembolsos']
+
+    _cronometrar(
+        tiempos, 'uniones pd.merge',
+        lambda: pd.merge(pd.merge(desembolsos_df, operaciones, left_on='IDOperacion', right_on='IDEtapa'), proyectos, on='NoProyecto'),
+        repeticiones,
+    )
+    hechos = {}
+    for union, how in {(union, how) for _, union, how in PAGINAS.values()}:
+        hechos[union, how] = _cronometrar(
+            tiempos, f'uniones build_fact_table {union} {how}',
+            lambda union=union, how=how: add_years(build_fact_table(proyectos, operaciones, desembolsos_df, union, how)),
+            repeticiones,
+        )
+    cubos = {
+        variante: _cronometrar(tiempos, f'cubo {variante[0]} {variante[1]}', lambda h=h: build_cube(h), repeticiones)
+        for variante, h in hechos.items()
+    }
+
+    for pagina, (clave, union, how) in PAGINAS.items():
+        _cronometrar(
+            tiempos, f'process_data {pagina}',
+            lambda clave=clave, union=union, how=how: [compute_curves(cubos[union, how], clave, eje) for eje in ('Ano', 'Ano_FechaEfectiva')],
+            repeticiones,
+        )
+    filas = _cronometrar(
+        tiempos, 'process_data 5_pp',
+        lambda: year_rows(build_fact_table(proyectos, operaciones, desembolsos_df, 'IDOperacion', 'left')),
+        repeticiones,
+    )
+
+    _cronometrar(
+        tiempos, 'create_pivot_table denso',
+        lambda: pd.pivot_table(filas, values='Monto', index='IDEtapa', columns='Ano', aggfunc='sum', fill_value=0),
+        repeticiones,
+    )
+    _cronometrar(tiempos, 'create_pivot_table largo', lambda: sparse_pivot(long_cells(filas, 'Monto')), repeticiones)
+
+    curva = compute_curves(cubos['IDOperacion', 'inner'], 'Pais', 'Ano')
+    una = curva[curva['Pais'] == curva['Pais'].iloc[0]].reset_index(drop=True)
+    _cronometrar(tiempos, 'grafico curve_chart', lambda: curve_chart(una, 'Ano', 'Curva').to_dict(), repeticiones)
+    return tiempos
+
+
+def _comparar(actual, anterior):
+    print(f"\ncomparado con {anterior.get('commit')}:")
+    for tamano, tiempos in actual['resultados'].items():
+        previos = anterior.get('resultados', {}).get(tamano, {})
+        for etapa, segundos in tiempos.items():
+            if etapa in previos and previos[etapa] > 0:
+                print(f"  {tamano:>4} {etapa:<45} {segundos / previos[etapa]:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanos", nargs="+", default=["10k", "100k", "1M"], choices=list(TAMANOS))
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--salida", default=None, help=f"archivo JSON (por defecto en {DIRECTORIO_RESULTADOS})")
+    parser.add_argument("--comparar", default=None, help="JSON de una ejecución anterior")
+    args = parser.parse_args()
+
+    commit = _commit()
+    resultado = {
+        'commit': commit,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'resultados': {},
+    }
+    for tamano in args.tamanos:
+        tiempos = run_size(TAMANOS[tamano], args.repeticiones)
+        resultado['resultados'][tamano] = tiempos
+        print(f"{tamano}:")
+        for etapa, segundos in tiempos.items():
+            print(f"  {etapa:<45} {segundos:>9.3f}s")
+
+    salida = args.salida or os.path.join(DIRECTORIO_RESULTADOS, f"{commit or 'sin_commit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w") as archivo:
+        json.dump(resultado, archivo, indent=2)
+    print(f"Resultados guardados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            _comparar(resultado, json.load(archivo))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import functools
+import threading
+
+import pandas as pd
+
+# Copy-on-write: los resultados memorizados se comparten entre sesiones y
+# las selecciones, ``assign`` y ``set_index`` sobre ellos no copian columnas;
+# una página que modifica su resultado obtiene su propia copia sin tocar la
+# compartida. pandas 3 ya lo usa siempre y la opción está en desuso.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Versiones de los datos que se conservan por combinación de argumentos: la
+# vigente y la anterior, que pueden seguir usando las ejecuciones en curso
+# mientras se publica una actualización
+VERSIONES = 2
+
+
+def por_hojas(funcion):
+    """Memoriza ``funcion(hojas, ...)`` mientras las tablas de origen no cambien.
+
+    El cargador devuelve los mismos DataFrames mientras el contenido de las
+    hojas no cambia, así que su identidad sirve como versión de los datos. Se
+    guarda un resultado por combinación de argumentos para las últimas
+    VERSIONES versiones; una sola sesión calcula cada resultado y las demás
+    lo esperan. Cada (argumentos, versión) tiene su propio lock, así que
+    mientras se calcula uno se siguen sirviendo los ya memorizados y se
+    pueden calcular otros a la vez.
+    """
+    cache = {}
+    # Protege cache y locks; solo se toma por instantes, nunca durante un cálculo
+    cache_lock = threading.Lock()
+    # Un lock por cálculo en curso: (clave, versión) -> Lock
+    locks = {}
+
+    def _buscar(clave, version):
+        for entrada in cache.get(clave, ()):
+            if entrada[0] == version:
+                return entrada
+        return None
+
+    def _lock(clave, version):
+        with cache_lock:
+            lock = locks.get((clave, version))
+            if lock is None:
+                lock = locks[(clave, version)] = threading.Lock()
+            return lock
+
+    @functools.wraps(funcion)
+    def envoltura(hojas, *args, **kwargs):
+        origen = (hojas.proyectos, hojas.operaciones, hojas.desembolsos)
+        version = tuple(map(id, origen))
+        clave = (args, tuple(sorted(kwargs.items())))
+        entrada = _buscar(clave, version)
+        if entrada is not None:
+            return entrada[2]
+        with _lock(clave, version):
+            entrada = _buscar(clave, version)
+            if entrada is not None:
+                return entrada[2]
+            try:
+                resultado = funcion(hojas, *args, **kwargs)
+                with cache_lock:
+                    # Se guarda también el origen para que sus id() no se reutilicen mientras viva la entrada
+                    cache[clave] = ((version, origen, resultado),) + cache.get(clave, ())[:VERSIONES - 1]
+                return resultado
+            finally:
+                # Quien llegue después encuentra el resultado en cache sin pasar por el lock
+                with cache_lock:
+                    locks.pop((clave, version), None)
+
+    def invalidate():
+        with cache_lock:
+            cache.clear()
+
+    envoltura.invalidate = invalidate
+    return envoltura
@@ -0,0 +1,76 @@
+"""Gráficos de curvas S: un solo gráfico por eje con las tres series.
+
+Monto, Monto Acumulado y Porcentaje Acumulado se dibujan como facetas de un
+mismo gráfico (``transform_fold``), de modo que la especificación Vega-Lite
+lleva una sola copia de los datos como dataset con nombre. Las
+especificaciones se guardan por huella de los datos y no se reconstruyen en
+cada rerun mientras la curva no cambie. Antes de construirlas, los datos
+pasan por la reducción configurada para el gráfico (ver reduction.py).
+"""
+import threading
+
+import altair as alt
+import pandas as pd
+
+from metrics import span
+from reduction import Reduccion, reduce_chart_data
+
+SERIES = ['Monto', 'Monto Acumulado', 'Porcentaje Acumulado']
+COLORES = ['steelblue', 'goldenrod', 'salmon']
+
+# Reducción por defecto de una curva: LTTB a 200 puntos y como máximo 1000 filas
+REDUCCION_CURVAS = Reduccion(puntos=200, max_filas=1000)
+
+# Especificaciones ya construidas: (huella, x_col, título, reducción) -> dict Vega-Lite
+MAX_SPECS = 256
+_specs = {}
+_specs_lock = threading.Lock()
+
+
+def _huella(data):
+    return len(data), tuple(data.columns), int(pd.util.hash_pandas_object(data, index=False).sum())
+
+
+def curve_chart(data, x_col, title, reduccion=REDUCCION_CURVAS):
+    """Gráfico facetado por serie (una fila por serie) con etiquetas de valor.
+
+    Si la reducción recorta filas, el título lo indica como subtítulo.
+    """
+    data, nota = reduce_chart_data(data, x_col, SERIES, reduccion)
+    linea = alt.Chart().mark_line(point=True).encode(
+        x=alt.X(f'{x_col}:O', axis=alt.Axis(title='Año', labelAngle=0)),
+        y=alt.Y('Valor:Q', axis=alt.Axis(title=None)),
+        color=alt.Color('Serie:N', scale=alt.Scale(domain=SERIES, range=COLORES), legend=None),
+        tooltip=[f'{x_col}:O', 'Serie:N', alt.Tooltip('Valor:Q', format='.2f')],
+    )
+    texto = linea.mark_text(
+        align='left',
+        baseline='middle',
+        dx=18,
+        dy=-18
+    ).encode(
+        text=alt.Text('Valor:Q', format='.2f')
+    )
+    return (
+        alt.layer(linea, texto)
+        .properties(width=600, height=400)
+        .facet(row=alt.Row('Serie:N', sort=SERIES, header=alt.Header(title=None)), data=data[[x_col] + SERIES])
+        .transform_fold(SERIES, as_=['Serie', 'Valor'])
+        .resolve_scale(y='independent')
+        .properties(title=alt.TitleParams(title, subtitle=nota) if nota else title)
+    )
+
+
+def curve_chart_spec(data, x_col, title, reduccion=REDUCCION_CURVAS):
+    """Especificación Vega-Lite de curve_chart, memorizada por huella de ``data``."""
+    clave = (_huella(data), x_col, title, reduccion)
+    spec = _specs.get(clave)
+    if spec is None:
+        with span("grafico", x_col, filas=len(data)):
+            spec = curve_chart(data, x_col, title, reduccion).to_dict()
+        with _specs_lock:
+            if len(_specs) >= MAX_SPECS:
+                _specs.pop(next(iter(_specs)))
+            _specs[clave] = spec
+    # Copia superficial: st.vega_lite_chart puede quitar o agregar claves de primer nivel
+    return dict(spec)
@@ -0,0 +1,165 @@
+"""Cubo agregado de desembolsos por entidad, años desde la vigencia y año calendario.
+
+Se construye una vez por actualización al grano más fino que usan las páginas
+(IDEtapa con sus atributos de área y país, Ano, Ano_FechaEfectiva). Cualquier
+vista por proyecto, sector, subsector o país, y sus roll-ups, se responde
+agregando el cubo por la clave de la vista (curves.compute_curves), sin
+volver a recorrer las filas de desembolsos.
+
+Entre actualizaciones el cubo se mantiene de forma incremental: solo se
+unen y agregan los desembolsos nuevos, modificados o eliminados (por
+IDDesembolso) y se aplican sus deltas; un cambio en operaciones o proyectos obliga a reconstruirlo.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from caching import por_hojas
+from fact_table import CLAVES, add_years, build_fact_table, filtered_facts
+from metrics import span
+
+DIMENSIONES = ['IDEtapa', 'IDAreaPrioritaria', 'IDAreaIntervencion', 'Pais']
+EJES = ['Ano', 'Ano_FechaEfectiva']
+
+
+def build_cube(hechos):
+    """Suma de Monto y cantidad de filas por dimensiones y ejes."""
+    # dropna=False conserva las filas sin área o país para las vistas por otras dimensiones
+    with span("cubo", filas=len(hechos)):
+        return (
+            hechos.groupby(DIMENSIONES + EJES, observed=True, dropna=False)
+            .agg(Monto=('Monto', 'sum'), Filas=('Monto', 'size'))
+            .reset_index()
+        )
+
+
+def _combinar(*cubos):
+    """Suma cubos celda a celda y descarta las celdas que quedaron sin filas."""
+    cubo = (
+        pd.concat(cubos, ignore_index=True)
+        .groupby(DIMENSIONES + EJES, observed=True, dropna=False)[['Monto', 'Filas']]
+        .sum()
+        .reset_index()
+    )
+    return cubo[cubo['Filas'] > 0].reset_index(drop=True)
+
+
+def _huella(df):
+    return len(df), int(pd.util.hash_pandas_object(df, index=False).sum())
+
+
+class IncrementalCube:
+    """Cubo que se actualiza aplicando solo los desembolsos nuevos, modificados o eliminados."""
+
+    def __init__(self, union='IDOperacion', how='inner'):
+        self.union = union
+        self.how = how
+        self.cubo = None
+        self.reconstrucciones = 0
+        self._dimensiones = None
+        # Estado de la actualización anterior; None obliga a reconstruir la próxima vez
+        self._desembolsos = None
+        self._tabla = None
+        self._lock = threading.Lock()
+
+    def _columnas(self):
+        return ['IDDesembolso', CLAVES[self.union][0], 'Monto', 'FechaEfectiva']
+
+    def _cubo_de(self, proyectos, operaciones, desembolsos):
+        hechos = build_fact_table(proyectos, operaciones, desembolsos, self.union, self.how)
+        return build_cube(add_years(hechos))
+
+    def update(self, proyectos, operaciones, desembolsos, hechos=None):
+        """Lleva el cubo al estado de las tablas recibidas y lo devuelve.
+
+        ``hechos``, si se recibe, es una función sin argumentos que devuelve la
+        tabla con años de esas tablas (fact_table.filtered_facts); solo se
+        llama si hay que reconstruir.
+        """
+        with self._lock:
+            desembolsos = desembolsos[self._columnas()].reset_index(drop=True)
+            dimensiones = (_huella(proyectos), _huella(operaciones))
+            # Las comparaciones se hacen en Arrow: sin convertir los textos a objetos de Python
+            tabla = pa.Table.from_pandas(desembolsos, preserve_index=False)
+            cubo = None
+            if self.cubo is not None and self._tabla is not None and dimensiones == self._dimensiones:
+                cubo = self._aplicar_cambios(proyectos, operaciones, desembolsos, tabla)
+                ids_validos = cubo is not None
+            if cubo is None:
+                if hechos is None:
+                    cubo = self._cubo_de(proyectos, operaciones, desembolsos)
+                else:
+                    cubo = build_cube(hechos())
+                self.reconstrucciones += 1
+                ids = tabla.column('IDDesembolso')
+                ids_validos = ids.null_count == 0 and len(pc.unique(ids)) == len(ids)
+            self.cubo = cubo
+            self._dimensiones = dimensiones
+            if ids_validos:
+                self._desembolsos, self._tabla = desembolsos, tabla
+            else:
+                # Sin IDDesembolso únicos no se pueden comparar las filas: la próxima vez se reconstruye
+                self._desembolsos = self._tabla = None
+            return self.cubo
+
+    def _aplicar_cambios(self, proyectos, operaciones, desembolsos, tabla):
+        """Cubo con los deltas aplicados, o None si los IDDesembolso no permiten comparar filas."""
+        anterior = self._tabla
+        ids = tabla.column('IDDesembolso')
+        if ids.null_count:
+            return None
+        # Posición de cada desembolso en la actualización anterior (-1 si es nuevo), con un solo hash join
+        previas = pc.index_in(ids, value_set=anterior.column('IDDesembolso')).fill_null(-1).to_numpy()
+        existian = previas >= 0
+        # Los ids anteriores eran únicos: basta revisar que ninguno se repita ahora y que los nuevos sean únicos
+        nuevos = ids.filter(pa.array(~existian))
+        if np.bincount(previas[existian], minlength=1).max(initial=0) > 1 or len(pc.unique(nuevos)) != len(nuevos):
+            return None
+
+        # Un desembolso que ya existía cambió si difiere en alguna columna
+        posiciones = pa.array(previas[existian])
+        actuales = tabla.filter(pa.array(existian))
+        cambiaron = np.zeros(len(posiciones), dtype=bool)
+        for columna in tabla.column_names[1:]:
+            antes = anterior.column(columna).take(posiciones)
+            ahora = actuales.column(columna)
+            distinto = pc.fill_null(pc.not_equal(antes, ahora), False)
+            distinto = pc.or_(distinto, pc.xor(pc.is_null(antes), pc.is_null(ahora)))
+            cambiaron |= distinto.to_numpy()
+
+        entran = ~existian
+        entran[existian] = cambiaron
+        # Salen las filas anteriores eliminadas o modificadas
+        salen = np.ones(len(anterior), dtype=bool)
+        salen[previas[existian][~cambiaron]] = False
+        if not (entran.any() or salen.any()):
+            return self.cubo
+
+        delta_entran = self._cubo_de(proyectos, operaciones, desembolsos[entran])
+        delta_salen = self._cubo_de(proyectos, operaciones, self._desembolsos[salen])
+        delta_salen[['Monto', 'Filas']] = -delta_salen[['Monto', 'Filas']]
+        return _combinar(self.cubo, delta_entran, delta_salen)
+
+
+# Un cubo incremental por variante de unión, compartido por todo el proceso
+_incrementales = {}
+_incrementales_lock = threading.Lock()
+
+
+@por_hojas
+def cube(hojas, union='IDOperacion', how='inner'):
+    """Cubo de la actualización en curso para la variante de unión indicada.
+
+    Al reconstruirlo se agrega la tabla de hechos memorizada de las páginas
+    en lugar de unir otra copia; una actualización incremental no la necesita.
+    """
+    with _incrementales_lock:
+        incremental = _incrementales.setdefault((union, how), IncrementalCube(union, how))
+    return incremental.update(
+        hojas.proyectos, hojas.operaciones, hojas.desembolsos,
+        hechos=lambda: filtered_facts(hojas, union, how=how),
+    )
+
@@ -0,0 +1,46 @@
+"""Motor de curvas S: Monto, Monto Acumulado y porcentajes de todas las entidades a la vez.
+
+Las curvas se calculan en una sola pasada vectorizada (``groupby`` con
+``cumsum``/``transform``, sin lambdas) para todos los valores de la clave y
+quedan memorizadas hasta la próxima actualización, de modo que cambiar de
+proyecto en la página es una búsqueda en un diccionario.
+"""
+from caching import por_hojas
+from cube import cube
+from metrics import span
+
+COLUMNAS_CURVA = ['Monto', 'Monto Acumulado', 'Porcentaje del Monto', 'Porcentaje Acumulado']
+
+
+def compute_curves(df, clave, eje):
+    """Curvas de cada valor de ``clave`` a lo largo de ``eje`` ('Ano' o 'Ano_FechaEfectiva').
+
+    ``df`` puede ser la tabla de hechos o el cubo: solo se suma su columna Monto.
+    Los montos se expresan en millones; montos y porcentajes se redondean a 2 decimales.
+    """
+    with span("curvas", f"{clave} {eje}", filas=len(df)):
+        curvas = df.groupby([clave, eje], observed=True)['Monto'].sum().reset_index()
+        por_clave = curvas.groupby(clave, observed=True, sort=False)['Monto']
+        curvas['Monto Acumulado'] = por_clave.cumsum()
+        curvas['Porcentaje del Monto'] = curvas['Monto'] / por_clave.transform('sum') * 100
+        maximo = curvas.groupby(clave, observed=True, sort=False)['Monto Acumulado'].transform('max')
+        curvas['Porcentaje Acumulado'] = curvas['Monto Acumulado'] / maximo * 100
+
+        # Convertir 'Monto' y 'Monto Acumulado' a millones y redondear a 2 decimales
+        curvas['Monto'] = curvas['Monto'] / 1000000
+        curvas['Monto Acumulado'] = curvas['Monto Acumulado'] / 1000000
+        curvas[COLUMNAS_CURVA] = curvas[COLUMNAS_CURVA].round(2)
+    return curvas
+
+
+@por_hojas
+def curves(hojas, clave, eje, union='IDOperacion', how='inner'):
+    """Curvas de todos los valores de ``clave``, como diccionario valor -> DataFrame.
+
+    Se calculan desde el cubo agregado, no desde las filas de desembolsos.
+    """
+    curvas = compute_curves(cube(hojas, union, how=how), clave, eje)
+    return {
+        valor: grupo.reset_index(drop=True)
+        for valor, grupo in curvas.groupby(clave, observed=True, sort=False)
+    }
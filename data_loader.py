@@ -0,0 +1,158 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+from metrics import span
+from schema import read_table
+
+# URLs de las hojas de Google Sheets
+sheet_url_proyectos = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSHedheaRLyqnjwtsRvlBFFOnzhfarkFMoJ04chQbKZCBRZXh_2REE3cmsRC69GwsUK0PoOVv95xptX/pub?gid=2084477941&single=true&output=csv"
+sheet_url_operaciones = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSHedheaRLyqnjwtsRvlBFFOnzhfarkFMoJ04chQbKZCBRZXh_2REE3cmsRC69GwsUK0PoOVv95xptX/pub?gid=1468153763&single=true&output=csv"
+sheet_url_desembolsos = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSHedheaRLyqnjwtsRvlBFFOnzhfarkFMoJ04chQbKZCBRZXh_2REE3cmsRC69GwsUK0PoOVv95xptX/pub?gid=1657640798&single=true&output=csv"
+
+SHEET_URLS = {
+    "proyectos": sheet_url_proyectos,
+    "operaciones": sheet_url_operaciones,
+    "desembolsos": sheet_url_desembolsos,
+}
+
+# Las tres hojas cargadas juntas, con el tiempo de carga en segundos de cada una
+Hojas = namedtuple("Hojas", ["proyectos", "operaciones", "desembolsos", "tiempos"])
+
+# Segundos que una hoja descargada se considera vigente (configurable por entorno)
+DEFAULT_TTL = float(os.environ.get("SHEETS_CACHE_TTL", 600))
+FETCH_TIMEOUT = 60
+
+# Hoja en caché junto con los validadores HTTP y el hash del contenido descargado
+_Entrada = namedtuple("_Entrada", ["cargado", "df", "etag", "last_modified", "hash"])
+
+# Caché compartida por todas las sesiones del proceso: (url, esquema) -> _Entrada
+# (la misma hoja leída con y sin esquema da DataFrames distintos)
+_cache = {}
+_cache_lock = threading.Lock()
+# Un candado por (url, esquema) para que sesiones concurrentes hagan una sola descarga
+_url_locks = {}
+
+
+def _url_lock(clave):
+    with _cache_lock:
+        lock = _url_locks.get(clave)
+        if lock is None:
+            lock = _url_locks[clave] = threading.Lock()
+        return lock
+
+
+def _fresh_entry(clave, ttl):
+    entry = _cache.get(clave)
+    if entry is not None and time.monotonic() - entry.cargado < ttl:
+        return entry
+    return None
+
+
+def _fetch(url, previa, esquema):
+    """Descarga la hoja, revalidando contra la entrada previa cuando existe.
+
+    Con un 304, o con el mismo contenido cuando el servidor no envía
+    validadores, se reutiliza el DataFrame ya parseado.
+    """
+    with span("hojas.descarga", esquema) as medicion:
+        if not url.startswith(("http://", "https://")):
+            with open(url, "rb") as archivo:
+                contenido = archivo.read()
+            etag = last_modified = None
+        else:
+            peticion = Request(url)
+            if previa is not None and previa.etag:
+                peticion.add_header("If-None-Match", previa.etag)
+            if previa is not None and previa.last_modified:
+                peticion.add_header("If-Modified-Since", previa.last_modified)
+            try:
+                with urlopen(peticion, timeout=FETCH_TIMEOUT) as respuesta:
+                    contenido = respuesta.read()
+                    etag = respuesta.headers.get("ETag")
+                    last_modified = respuesta.headers.get("Last-Modified")
+            except HTTPError as error:
+                if error.code == 304 and previa is not None:
+                    return previa._replace(cargado=time.monotonic())
+                raise
+        medicion.filas = contenido.count(b"\n")
+
+    digest = hashlib.sha256(contenido).hexdigest()
+    if previa is not None and previa.hash == digest:
+        df = previa.df
+    else:
+        with span("hojas.lectura", esquema) as medicion:
+            df = read_table(contenido, esquema) if esquema else pd.read_csv(io.BytesIO(contenido))
+            medicion.filas = len(df)
+    return _Entrada(time.monotonic(), df, etag, last_modified, digest)
+
+
+def load_data(url, ttl=None, esquema=None):
+    """Carga una hoja publicada como CSV, compartiendo el resultado entre sesiones.
+
+    Pasado el TTL la hoja se revalida con una petición condicional en lugar
+    de descargarse y parsearse de nuevo. El DataFrame devuelto es compartido:
+    los llamadores deben seleccionar columnas o copiar antes de modificarlo.
+    Con ``esquema`` (una clave de schema.ESQUEMAS) la hoja se lee ya tipada.
+    """
+    if ttl is None:
+        ttl = DEFAULT_TTL
+    clave = (url, esquema)
+    entry = _fresh_entry(clave, ttl)
+    if entry is not None:
+        return entry.df
+
+    # Solo la primera sesión descarga; las demás esperan su resultado
+    with _url_lock(clave):
+        entry = _fresh_entry(clave, ttl)
+        if entry is not None:
+            return entry.df
+        entry = _fetch(url, _cache.get(clave), esquema)
+        with _cache_lock:
+            _cache[clave] = entry
+        return entry.df
+
+
+def invalidate(url=None):
+    """Descarta la hoja indicada de la caché (con cualquier esquema), o todas si no se indica ninguna.
+
+    También olvida sus validadores, de modo que la siguiente carga es completa.
+    """
+    with _cache_lock:
+        if url is None:
+            _cache.clear()
+        else:
+            for clave in [clave for clave in _cache if clave[0] == url]:
+                del _cache[clave]
+
+
+def _timed_load(url, ttl, esquema):
+    inicio = time.perf_counter()
+    df = load_data(url, ttl, esquema)
+    return df, time.perf_counter() - inicio
+
+
+def load_all(urls=None, ttl=None):
+    """Carga proyectos, operaciones y desembolsos en paralelo y los devuelve como Hojas.
+
+    Cada hoja se lee con su esquema declarado en schema.ESQUEMAS.
+    """
+    if urls is None:
+        urls = SHEET_URLS
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        futuros = {nombre: executor.submit(_timed_load, url, ttl, nombre) for nombre, url in urls.items()}
+        resultados = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    return Hojas(
+        proyectos=resultados["proyectos"][0],
+        operaciones=resultados["operaciones"][0],
+        desembolsos=resultados["desembolsos"][0],
+        tiempos={nombre: resultado[1] for nombre, resultado in resultados.items()},
+    )
@@ -0,0 +1,80 @@
+"""Ejecución de cada operación respecto de su propio aporte (AporteFONPLATAVigente).
+
+Para todas las operaciones a la vez, y por año, calcula el monto desembolsado,
+el acumulado, el porcentaje ejecutado y el saldo por desembolsar, cada uno
+normalizado por el aporte de su operación. Se calcula desde el cubo en una
+sola pasada y queda memorizado hasta la próxima actualización. Las
+operaciones sin desembolsos en el cubo también aparecen, con monto 0, para
+que su aporte cuente en el portafolio y su saldo quede informado.
+"""
+import pandas as pd
+
+from caching import por_hojas
+from cube import cube
+from metrics import span
+
+COLUMNAS_EJECUCION = ['Monto', 'Monto Acumulado', 'Aporte', 'Porcentaje del Monto', 'Porcentaje Ejecutado', 'Saldo']
+
+
+def compute_execution(cubo, operaciones, eje='Ano'):
+    """Ejecución por IDEtapa y ``eje`` a partir del cubo y del aporte de cada operación.
+
+    Una operación sin aporte (o con aporte 0) queda con porcentajes NaN. Una
+    operación sin desembolsos en el cubo queda en una sola fila con monto 0 y
+    saldo igual al aporte, en su primer año: 0 años desde la vigencia, o el año
+    de la vigencia en ``Ano_FechaEfectiva`` (el primero del portafolio si no
+    tiene fecha).
+    """
+    with span("ejecucion", eje, filas=len(cubo)):
+        ejecucion = cubo.groupby(['IDEtapa', 'Pais', eje], observed=True, dropna=False)['Monto'].sum().reset_index()
+        ejecucion = ejecucion[ejecucion['IDEtapa'].notna()]
+        sin_desembolsos = operaciones[
+            operaciones['IDEtapa'].notna() & ~operaciones['IDEtapa'].isin(ejecucion['IDEtapa'])
+        ]
+        if len(sin_desembolsos):
+            if eje == 'Ano':
+                inicio = 0
+            else:
+                primero = ejecucion[eje].min() if len(ejecucion) else 0
+                inicio = sin_desembolsos['FechaVigencia'].dt.year.fillna(primero).to_numpy()
+            faltantes = pd.DataFrame({
+                'IDEtapa': sin_desembolsos['IDEtapa'].to_numpy(),
+                'Pais': sin_desembolsos['Pais'].to_numpy(),
+                eje: inicio,
+                'Monto': 0.0,
+            }).astype({eje: ejecucion[eje].dtype, 'Pais': ejecucion['Pais'].dtype})
+            ejecucion = pd.concat([ejecucion, faltantes], ignore_index=True)
+        ejecucion = ejecucion.sort_values(['IDEtapa', eje], kind='stable')
+        aportes = operaciones.dropna(subset=['IDEtapa']).set_index('IDEtapa')['AporteFONPLATAVigente']
+        aporte = aportes.reindex(ejecucion['IDEtapa']).to_numpy()
+        ejecucion['Monto Acumulado'] = ejecucion.groupby('IDEtapa', sort=False)['Monto'].cumsum()
+        ejecucion['Aporte'] = aporte
+        divisor = ejecucion['Aporte'].where(ejecucion['Aporte'] != 0)
+        ejecucion['Porcentaje del Monto'] = ejecucion['Monto'] / divisor * 100
+        ejecucion['Porcentaje Ejecutado'] = ejecucion['Monto Acumulado'] / divisor * 100
+        ejecucion['Saldo'] = ejecucion['Aporte'] - ejecucion['Monto Acumulado']
+    return ejecucion.reset_index(drop=True)
+
+
+@por_hojas
+def execution(hojas, eje='Ano'):
+    """Ejecución de todo el portafolio por operación y ``eje``, memorizada."""
+    return compute_execution(cube(hojas, 'IDOperacion', how='inner'), hojas.operaciones, eje)
+
+
+def portfolio_execution(ejecucion, etapas=None, eje='Ano'):
+    """Ejecución agregada de las operaciones ``etapas`` (todas si es None) por ``eje``.
+
+    El porcentaje se calcula sobre la suma de los aportes de esas operaciones,
+    contando cada aporte una sola vez.
+    """
+    if etapas is not None:
+        ejecucion = ejecucion[ejecucion['IDEtapa'].isin(etapas)]
+    aporte_total = ejecucion.drop_duplicates('IDEtapa')['Aporte'].sum()
+    portafolio = ejecucion.groupby(eje)['Monto'].sum().reset_index()
+    portafolio['Monto Acumulado'] = portafolio['Monto'].cumsum()
+    divisor = aporte_total if aporte_total else float('nan')
+    portafolio['Porcentaje del Monto'] = portafolio['Monto'] / divisor * 100
+    portafolio['Porcentaje Ejecutado'] = portafolio['Monto Acumulado'] / divisor * 100
+    portafolio['Saldo'] = aporte_total - portafolio['Monto Acumulado']
+    return portafolio
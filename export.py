@@ -0,0 +1,103 @@
+"""Exportación de tablas a Excel, CSV y Parquet.
+
+Los bytes se generan solo cuando se pide una descarga y se guardan por huella
+de los datos y formato, así que el mismo archivo no se vuelve a generar en
+cada rerun ni para cada sesión. El Excel se escribe fila a fila con
+xlsxwriter en modo ``constant_memory`` (u openpyxl ``write_only`` si
+xlsxwriter no está instalado) en lugar de construir el libro entero.
+"""
+import io
+import threading
+
+import pandas as pd
+
+from metrics import span
+
+# formato -> (extensión, tipo MIME)
+FORMATOS = {
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+HOJA = 'Resultados'
+# Filas que se convierten a objetos Python de una vez al escribir el Excel
+BLOQUE_FILAS = 10_000
+
+# Archivos ya generados: (huella, formato) -> bytes
+MAX_ARCHIVOS = 32
+_archivos = {}
+# Huellas ya calculadas: id(df) -> (df, huella)
+_huellas = {}
+_lock = threading.Lock()
+
+
+def fingerprint(df):
+    """Huella del contenido de ``df``; se calcula una vez por objeto."""
+    entrada = _huellas.get(id(df))
+    if entrada is not None and entrada[0] is df:
+        return entrada[1]
+    huella = (tuple(df.columns), len(df), int(pd.util.hash_pandas_object(df, index=False).sum()))
+    with _lock:
+        if len(_huellas) >= MAX_ARCHIVOS:
+            _huellas.pop(next(iter(_huellas)))
+        _huellas[id(df)] = (df, huella)
+    return huella
+
+
+def _filas(df):
+    """Filas de ``df`` como listas de objetos Python, con None en lugar de NaN/NaT."""
+    yield list(map(str, df.columns))
+    for inicio in range(0, len(df), BLOQUE_FILAS):
+        bloque = df.iloc[inicio:inicio + BLOQUE_FILAS].astype(object)
+        yield from bloque.where(bloque.notna(), None).to_numpy().tolist()
+
+
+def _excel(df):
+    salida = io.BytesIO()
+    try:
+        import xlsxwriter
+    except ImportError:
+        import openpyxl
+
+        libro = openpyxl.Workbook(write_only=True)
+        hoja = libro.create_sheet(HOJA)
+        for fila in _filas(df):
+            hoja.append(fila)
+        libro.save(salida)
+        return salida.getvalue()
+
+    libro = xlsxwriter.Workbook(salida, {'constant_memory': True, 'default_date_format': 'dd/mm/yyyy'})
+    hoja = libro.add_worksheet(HOJA)
+    for numero, fila in enumerate(_filas(df)):
+        hoja.write_row(numero, 0, fila)
+    libro.close()
+    return salida.getvalue()
+
+
+def _generar(df, formato):
+    if formato == 'xlsx':
+        return _excel(df)
+    if formato == 'csv':
+        return df.to_csv(index=False).encode('utf-8')
+    if formato == 'parquet':
+        return df.to_parquet(index=False)
+    raise ValueError(f"Formato de exportación desconocido: {formato!r}")
+
+
+def cached_export(df, formato):
+    """Bytes ya generados de ``df`` en ``formato``, o None si todavía no se pidieron."""
+    return _archivos.get((fingerprint(df), formato))
+
+
+def export_bytes(df, formato):
+    """Bytes de ``df`` en ``formato`` ('xlsx', 'csv' o 'parquet'), generados una sola vez."""
+    clave = (fingerprint(df), formato)
+    contenido = _archivos.get(clave)
+    if contenido is None:
+        with span("exportacion", formato, filas=len(df)):
+            contenido = _generar(df, formato)
+        with _lock:
+            if len(_archivos) >= MAX_ARCHIVOS:
+                _archivos.pop(next(iter(_archivos)))
+            _archivos[clave] = contenido
+    return contenido
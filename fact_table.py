@@ -0,0 +1,112 @@
+"""Tabla de hechos enriquecida: desembolsos → operaciones → proyectos.
+
+Se construye una vez por actualización de datos y la comparten todas las
+páginas en lugar de repetir los dos ``pd.merge`` en cada rerun. Las claves de
+las dimensiones se resuelven a códigos enteros con un índice único (hash join),
+y una clave duplicada en una dimensión se rechaza en vez de multiplicar filas
+de desembolsos en silencio. NoOperacion no es un identificador de la hoja: si
+se repite se usa la primera operación con ese número y se avisa en el log.
+"""
+import logging
+
+import pandas as pd
+
+from caching import por_hojas
+from metrics import span
+from transforms import periods_since
+
+LOGGER = logging.getLogger(__name__)
+
+# Variantes de la unión desembolsos → operaciones: (clave en desembolsos, clave en operaciones)
+CLAVES = {
+    'IDOperacion': ('IDOperacion', 'IDEtapa'),
+    'NoOperacion': ('NoOperacion', 'NoOperacion'),
+}
+
+# Claves de dimensión que pueden repetirse en la hoja: cuenta la primera fila de cada una
+CLAVES_REPETIBLES = {'NoOperacion'}
+
+COLUMNAS_OPERACIONES = ['NoProyecto', 'NoOperacion', 'IDEtapa', 'Alias', 'Pais', 'FechaVigencia', 'Estado', 'AporteFONPLATAVigente']
+COLUMNAS_PROYECTOS = ['IDAreaPrioritaria', 'IDAreaIntervencion']
+
+
+def _codigos(dimension, clave, valores, nombre):
+    """Posición en ``dimension`` de cada valor de ``valores`` (-1 si no existe)."""
+    # Las filas sin clave no pueden unirse con nada
+    dimension = dimension[dimension[clave].notna()]
+    if clave in CLAVES_REPETIBLES:
+        repetidas = dimension[clave].duplicated()
+        if repetidas.any():
+            LOGGER.warning(
+                "%s.%s repetido en %d filas (%s); se usa la primera de cada uno",
+                nombre, clave, int(repetidas.sum()), list(dimension.loc[repetidas, clave].unique()[:10]),
+            )
+            dimension = dimension[~repetidas]
+    indice = pd.Index(dimension[clave])
+    if not indice.is_unique:
+        duplicadas = indice[indice.duplicated()].unique()
+        raise ValueError(
+            f"Claves duplicadas en {nombre}.{clave} ({len(duplicadas)}): {list(duplicadas[:10])}; "
+            "multiplicarían las filas de desembolsos"
+        )
+    return dimension, indice.get_indexer(valores)
+
+
+def _alinear(dimension, columnas, codigos, indice):
+    """Columnas de ``dimension`` en el orden de ``codigos``; -1 queda como faltante."""
+    atributos = dimension[columnas].reset_index(drop=True).reindex(codigos)
+    atributos.index = indice
+    return atributos
+
+
+def build_fact_table(proyectos, operaciones, desembolsos, clave='IDOperacion', how='inner'):
+    """Une desembolsos con operaciones (por ``clave``) y con proyectos (por NoProyecto).
+
+    Equivale a los dos ``pd.merge`` de las páginas con ``how`` para la primera
+    unión y 'left' para la segunda. Agrega CodOperacion y CodProyecto, las
+    posiciones enteras de cada fila en sus dimensiones (-1 sin coincidencia).
+    """
+    clave_hechos, clave_dimension = CLAVES[clave]
+    hechos = desembolsos[['IDDesembolso', clave_hechos, 'Monto', 'FechaEfectiva']].reset_index(drop=True)
+
+    with span("union", f"operaciones {clave} {how}", filas=len(hechos)):
+        operaciones, cod_operacion = _codigos(operaciones, clave_dimension, hechos[clave_hechos], 'operaciones')
+        if how == 'inner':
+            coinciden = cod_operacion >= 0
+            hechos = hechos[coinciden].reset_index(drop=True)
+            cod_operacion = cod_operacion[coinciden]
+        columnas_operaciones = [columna for columna in COLUMNAS_OPERACIONES if columna != clave_hechos]
+        atributos_operacion = _alinear(operaciones, columnas_operaciones, cod_operacion, hechos.index)
+
+    with span("union", "proyectos", filas=len(hechos)):
+        proyectos, cod_proyecto = _codigos(proyectos, 'NoProyecto', atributos_operacion['NoProyecto'], 'proyectos')
+        atributos_proyecto = _alinear(proyectos, COLUMNAS_PROYECTOS, cod_proyecto, hechos.index)
+
+    hechos = pd.concat([hechos, atributos_operacion, atributos_proyecto], axis=1)
+    hechos['CodOperacion'] = cod_operacion.astype('int32')
+    hechos['CodProyecto'] = cod_proyecto.astype('int32')
+    return hechos
+
+
+def add_years(hechos):
+    """Agrega Ano (años completos desde la vigencia) y Ano_FechaEfectiva.
+
+    Se descartan los desembolsos sin fechas o anteriores a la vigencia.
+    """
+    ano = periods_since(hechos['FechaVigencia'], hechos['FechaEfectiva']).fillna(-1)
+    validas = ano >= 0
+    hechos = hechos[validas]
+    return hechos.assign(Ano=ano[validas].astype(int), Ano_FechaEfectiva=hechos['FechaEfectiva'].dt.year)
+
+
+@por_hojas
+def filtered_facts(hojas, union='IDOperacion', how='inner'):
+    """Tabla de hechos con años desde la vigencia (ver add_years), memorizada.
+
+    La tabla sin filtrar se libera al terminar; esta es compartida entre
+    sesiones y no debe modificarse en el lugar. Un desembolso sin operación no
+    tiene vigencia y add_years lo descarta, así que 'left' e 'inner' dan las
+    mismas filas: con IDOperacion las páginas piden solo 'inner', la variante
+    del cubo, para no memorizar dos copias iguales.
+    """
+    return add_years(build_fact_table(hojas.proyectos, hojas.operaciones, hojas.desembolsos, union, how))
@@ -0,0 +1,163 @@
+"""Tiempos y filas de cada etapa del pipeline, compartidos por todo el proceso.
+
+Cada etapa se envuelve en ``span``: al terminar se acumulan sus ejecuciones,
+segundos y filas, se escribe una línea de log en JSON y se guarda en la lista
+de la ejecución en curso del hilo (cada sesión de Streamlit corre en el suyo).
+Las métricas se exportan como JSON o en formato de texto de Prometheus, y con
+la variable de entorno METRICS_PORT se sirven en ``/metrics`` (en la interfaz
+METRICS_HOST, por defecto 127.0.0.1).
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from streamlit.logger import get_logger
+
+# Logger de Streamlit: tiene su propio handler y sigue el nivel de logger.level
+# (INFO por defecto), mientras que la raíz de logging descarta los INFO
+LOGGER = get_logger(__name__)
+
+# (etapa, detalle) -> {'ejecuciones', 'segundos', 'maximo', 'ultimo', 'filas'}
+_metricas = {}
+_metricas_lock = threading.Lock()
+# Spans terminados en el hilo desde el último reset_run(), como máximo MAX_SPANS
+MAX_SPANS = 500
+_local = threading.local()
+_servidor = None
+
+
+class _Span:
+    __slots__ = ("etapa", "detalle", "filas", "segundos")
+
+    def __init__(self, etapa, detalle, filas):
+        self.etapa = etapa
+        self.detalle = detalle
+        self.filas = filas
+        self.segundos = None
+
+
+@contextmanager
+def span(etapa, detalle=None, filas=None):
+    """Mide el bloque como ``etapa``; ``filas`` se puede asignar dentro del bloque."""
+    medicion = _Span(etapa, detalle, filas)
+    inicio = time.perf_counter()
+    try:
+        yield medicion
+    finally:
+        medicion.segundos = time.perf_counter() - inicio
+        _registrar(medicion)
+
+
+def _registrar(medicion):
+    with _metricas_lock:
+        metrica = _metricas.setdefault(
+            (medicion.etapa, medicion.detalle),
+            {'ejecuciones': 0, 'segundos': 0.0, 'maximo': 0.0, 'ultimo': 0.0, 'filas': 0},
+        )
+        metrica['ejecuciones'] += 1
+        metrica['segundos'] += medicion.segundos
+        metrica['maximo'] = max(metrica['maximo'], medicion.segundos)
+        metrica['ultimo'] = medicion.segundos
+        metrica['filas'] += medicion.filas or 0
+    spans = run_spans()
+    spans.append(medicion)
+    if len(spans) > MAX_SPANS:
+        del spans[0]
+    LOGGER.info(json.dumps({
+        'etapa': medicion.etapa,
+        'detalle': medicion.detalle,
+        'segundos': round(medicion.segundos, 6),
+        'filas': medicion.filas,
+    }, ensure_ascii=False))
+
+
+def run_spans():
+    """Spans terminados en este hilo desde el último reset_run()."""
+    spans = getattr(_local, "spans", None)
+    if spans is None:
+        spans = _local.spans = []
+    return spans
+
+
+def reset_run():
+    """Empieza una nueva ejecución (un rerun) para run_spans()."""
+    _local.spans = []
+
+
+def snapshot():
+    """Copia de las métricas acumuladas: {(etapa, detalle): {...}}."""
+    with _metricas_lock:
+        return {clave: dict(valor) for clave, valor in _metricas.items()}
+
+
+def metrics_json():
+    """Métricas acumuladas como lista JSON, una entrada por etapa y detalle."""
+    return json.dumps(
+        [{'etapa': etapa, 'detalle': detalle, **valores} for (etapa, detalle), valores in sorted(snapshot().items(), key=str)],
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def _etiquetas(etapa, detalle):
+    etiquetas = f'etapa="{etapa}"'
+    if detalle is not None:
+        etiquetas += f',detalle="{detalle}"'
+    return etiquetas
+
+
+def metrics_prometheus():
+    """Métricas en el formato de texto de exposición de Prometheus."""
+    series = (
+        ('pipeline_etapa_ejecuciones_total', 'counter', 'ejecuciones'),
+        ('pipeline_etapa_segundos_total', 'counter', 'segundos'),
+        ('pipeline_etapa_segundos_max', 'gauge', 'maximo'),
+        ('pipeline_etapa_segundos_ultimo', 'gauge', 'ultimo'),
+        ('pipeline_etapa_filas_total', 'counter', 'filas'),
+    )
+    metricas = sorted(snapshot().items(), key=str)
+    lineas = []
+    for nombre, tipo, campo in series:
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        for (etapa, detalle), valores in metricas:
+            lineas.append(f"{nombre}{{{_etiquetas(etapa, detalle)}}} {valores[campo]}")
+    return "\n".join(lineas) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics.json":
+            cuerpo, tipo = metrics_json().encode("utf-8"), "application/json"
+        elif self.path.split("?")[0] == "/metrics":
+            cuerpo, tipo = metrics_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server(port=None):
+    """Sirve /metrics y /metrics.json en un hilo; una sola vez por proceso.
+
+    Sin ``port`` se usa METRICS_PORT y, si no está definida, no se inicia.
+    """
+    global _servidor
+    port = port or os.environ.get("METRICS_PORT")
+    if not port:
+        return None
+    with _metricas_lock:
+        if _servidor is None:
+            host = os.environ.get("METRICS_HOST", "127.0.0.1")
+            _servidor = ThreadingHTTPServer((host, int(port)), _Handler)
+            threading.Thread(target=_servidor.serve_forever, daemon=True).start()
+    return _servidor
@@ -0,0 +1,52 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+import numpy as np
+import io
+from datetime import datetime
+from charts import curve_chart_spec
+from curves import curves
+from utils import fragment, load_current, show_diagnostics, show_downloads
+
+# Inicializar la aplicación de Streamlit
+st.title("Análisis de Desembolsos por País")
+
+def process_data(hojas):
+    # Curvas de todos los países, servidas desde el cubo agregado de la actualización
+    curvas_ano = curves(hojas, 'Pais', 'Ano', 'IDOperacion', how='inner')
+    curvas_ano_efectiva = curves(hojas, 'Pais', 'Ano_FechaEfectiva', 'IDOperacion', how='inner')
+
+    # Selectbox para filtrar por Pais
+    selected_pais = st.selectbox('Select Pais to filter', list(curvas_ano))
+    result_df = curvas_ano[selected_pais]
+    result_df_ano_efectiva = curvas_ano_efectiva[selected_pais]
+
+    return result_df, result_df_ano_efectiva
+
+# Solo esta parte se vuelve a ejecutar al cambiar la selección
+@fragment
+def show_selection(hojas):
+    result_df, result_df_ano_efectiva = process_data(hojas)
+
+    # Mostrar la tabla "Tabla por Año"
+    st.write("Tabla por Año:", result_df)
+    show_downloads(result_df, "curva_por_ano", key="descarga_ano")
+
+    # Monto, Monto Acumulado y Porcentaje Acumulado en un solo gráfico por eje
+    st.vega_lite_chart(curve_chart_spec(result_df, 'Ano', 'Curva por Año (montos en millones)'), use_container_width=True)
+
+    # Mostrar la tabla "Tabla por Año de Fecha Efectiva"
+    st.write("Tabla por Año de Fecha Efectiva:", result_df_ano_efectiva)
+    show_downloads(result_df_ano_efectiva, "curva_por_ano_fecha_efectiva", key="descarga_ano_efectiva")
+
+    st.vega_lite_chart(curve_chart_spec(result_df_ano_efectiva, 'Ano_FechaEfectiva', 'Curva por Año de Fecha Efectiva (montos en millones)'), use_container_width=True)
+
+#Funcion
+def run():
+    # Cargar los datos: una vez por ejecución completa de la página
+    hojas = load_current()
+    show_selection(hojas)
+    show_diagnostics()
+
+if __name__ == "__main__":
+    run()
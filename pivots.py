@@ -0,0 +1,115 @@
+"""Tablas pivote IDEtapa × Ano de Monto y Porcentaje, por país.
+
+Cada país se agrega una sola vez por actualización. Como cada IDEtapa
+pertenece a un único país, la tabla de cualquier selección de países es la
+suma de los parciales de esos países y no hace falta recorrer los desembolsos.
+
+Las tablas se guardan en formato largo (solo las celdas con datos, una
+fila por IDEtapa y Ano) y solo se densifica la ventana de filas visible; los
+totales por IDEtapa se calculan sobre las celdas, sin la grilla completa.
+"""
+from collections import namedtuple
+
+import pandas as pd
+
+from caching import por_hojas
+from execution import execution
+from metrics import span
+from transforms import periods_since
+
+# Clave de los parciales para los desembolsos sin país
+SIN_PAIS = None
+
+# celdas: Serie con índice (IDEtapa, Ano) ordenado; totales: Serie por IDEtapa; anos: columnas de la grilla
+Pivote = namedtuple("Pivote", ["celdas", "totales", "anos"])
+
+
+def year_rows(hechos, periodo='Ano'):
+    """Desembolsos con Ano (períodos completos desde la vigencia) y Monto en millones.
+
+    ``periodo`` es una clave de transforms.PERIODOS; la columna se sigue llamando Ano.
+    """
+    ano = periods_since(hechos['FechaVigencia'], hechos['FechaEfectiva'], periodo).fillna(-1).astype(int)
+    validas = ano >= 0
+    # Se filtra antes de agregar columnas: la única copia es la de las filas que quedan
+    return in_millions(hechos[validas].assign(Ano=ano[validas]))
+
+
+def in_millions(filas):
+    """``filas`` con Monto en millones (3 decimales); con copy-on-write solo se crea esa columna."""
+    return filas.assign(Monto=(filas['Monto'] / 1_000_000).round(3))
+
+
+def long_cells(filas, value_column):
+    """Suma de ``value_column`` por (IDEtapa, Ano), solo para las celdas con filas."""
+    with span("pivote", value_column, filas=len(filas)):
+        return filas.groupby(['IDEtapa', 'Ano'], observed=True)[value_column].sum()
+
+
+def sparse_pivot(celdas):
+    """Pivote a partir de celdas en formato largo, con los totales por IDEtapa."""
+    celdas = celdas.sort_index()
+    totales = celdas.groupby(level='IDEtapa', sort=True).sum()
+    anos = celdas.index.get_level_values('Ano').unique().sort_values()
+    return Pivote(celdas, totales, anos)
+
+
+def densify(pivote, inicio=0, filas=None):
+    """Grilla densa (con Total) de las IDEtapa en ``[inicio, inicio + filas)``.
+
+    Equivale a las filas correspondientes del ``pd.pivot_table`` con
+    ``fill_value=0`` y la columna Total, pero solo se materializa la ventana.
+    """
+    etapas = pivote.totales.index[inicio:None if filas is None else inicio + filas]
+    columnas = pd.Index(pivote.anos, name='Ano')
+    if not len(etapas):
+        grilla = pd.DataFrame(index=etapas, columns=columnas, dtype='float64')
+    else:
+        # Las celdas están ordenadas por IDEtapa: la ventana es un tramo contiguo
+        niveles = pivote.celdas.index.get_level_values('IDEtapa')
+        desde = niveles.searchsorted(etapas[0], side='left')
+        hasta = niveles.searchsorted(etapas[-1], side='right')
+        grilla = pivote.celdas.iloc[desde:hasta].unstack('Ano', fill_value=0)
+        grilla = grilla.reindex(index=etapas, columns=columnas, fill_value=0)
+    grilla['Total'] = pivote.totales.reindex(etapas)
+    return grilla
+
+
+def _sin_celdas(value_column):
+    vacio = pd.MultiIndex.from_arrays([[], []], names=['IDEtapa', 'Ano'])
+    return pd.Series(dtype='float64', index=vacio, name=value_column)
+
+
+@por_hojas
+def country_pivots(hojas):
+    """Parciales por país en formato largo: diccionario país -> {valor: celdas}.
+
+    Monto (en millones, 3 decimales) y Porcentaje (el monto de cada año sobre
+    el aporte de su propia operación) salen de las mismas filas del motor de
+    ejecución (execution.py), así que ambos pivotes tienen las mismas
+    operaciones, incluidas las que no tienen desembolsos. Una operación sin
+    aporte queda con Porcentaje NaN.
+    """
+    parciales = {}
+    for pais, grupo in execution(hojas).groupby('Pais', observed=True, dropna=False, sort=False):
+        clave = SIN_PAIS if pd.isna(pais) else pais
+        celdas = grupo.set_index(['IDEtapa', 'Ano'])
+        parciales[clave] = {
+            'Monto': (celdas['Monto'] / 1_000_000).round(3),
+            'Porcentaje': celdas['Porcentaje del Monto'].round(2).rename('Porcentaje'),
+        }
+    return parciales
+
+
+def combine_pivots(parciales, paises, value_column):
+    """Pivote de ``paises`` (todos, incluidos los sin país, si no se indica ninguno)."""
+    if not paises:
+        claves = list(parciales)
+    else:
+        claves = [SIN_PAIS if pd.isna(pais) else pais for pais in paises]
+        claves = [clave for clave in claves if clave in parciales]
+    partes = [parciales[clave][value_column] for clave in claves]
+    if not partes:
+        return sparse_pivot(_sin_celdas(value_column))
+    # Cada IDEtapa está en un solo país: los parciales no se solapan y basta concatenarlos
+    return sparse_pivot(pd.concat(partes))
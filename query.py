@@ -0,0 +1,177 @@
+"""Motor SQL embebido (DuckDB) sobre las tablas limpias de la actualización.
+
+Proyectos, operaciones y desembolsos se registran en una conexión DuckDB en
+memoria, sin copiarlos, junto con las vistas de hechos de cada variante de
+unión (con Ano y Ano_FechaEfectiva, como fact_table.filtered_facts). Una
+consulta de agregación lee solo las columnas que nombra y aplica sus filtros
+al escanear, antes de las uniones, en lugar de materializar la tabla de
+hechos completa en pandas. Los resultados se guardan por versión de los
+datos, SQL y parámetros.
+
+Uso: python -m query "SELECT Pais, sum(Monto) FROM hechos WHERE Ano >= ? GROUP BY 1" [--param 2] [--salida archivo.csv]
+"""
+import argparse
+import json
+import threading
+from collections import namedtuple
+
+import duckdb
+
+from caching import por_hojas
+from fact_table import CLAVES, CLAVES_REPETIBLES
+from metrics import span
+from snapshot import load_hojas
+
+# Vista de hechos de cada variante de unión desembolsos → operaciones
+VISTAS = {'IDOperacion': 'hechos', 'NoOperacion': 'hechos_no_operacion'}
+
+# Columnas de las vistas de hechos que se pueden agrupar o filtrar en aggregate()
+COLUMNAS_HECHOS = [
+    'IDDesembolso', 'NoProyecto', 'NoOperacion', 'IDEtapa', 'Alias', 'Pais', 'Estado',
+    'IDAreaPrioritaria', 'IDAreaIntervencion', 'FechaVigencia', 'FechaEfectiva',
+    'Ano', 'Ano_FechaEfectiva',
+]
+VALORES = ['Monto', 'AporteFONPLATAVigente']
+
+# Años completos desde la vigencia por aniversario de calendario, igual que
+# transforms.periods_since: el aniversario del 29/02 o del 31 cae el último
+# día del mes cuando ese día no existe
+_ANIVERSARIO = "least(day(v), day(last_day(e)))"
+_ANO = f"""(
+    (year(e) - year(v)) * 12 + month(e) - month(v)
+    - CASE WHEN {_ANIVERSARIO} > day(e)
+             OR ({_ANIVERSARIO} = day(e) AND CAST(v AS TIME) > CAST(e AS TIME))
+           THEN 1 ELSE 0 END
+) // 12"""
+
+_VISTA_HECHOS = """
+CREATE VIEW {vista} AS
+SELECT IDDesembolso, NoProyecto, NoOperacion, IDEtapa, Alias, Pais, Estado, AporteFONPLATAVigente,
+       IDAreaPrioritaria, IDAreaIntervencion, Monto, FechaVigencia, FechaEfectiva,
+       {ano} AS Ano, year(e) AS Ano_FechaEfectiva
+FROM (
+    SELECT d.IDDesembolso, o.NoProyecto, o.NoOperacion, o.IDEtapa, o.Alias, o.Pais, o.Estado,
+           o.AporteFONPLATAVigente, p.IDAreaPrioritaria, p.IDAreaIntervencion, d.Monto,
+           o.FechaVigencia, d.FechaEfectiva,
+           CAST(o.FechaVigencia AS TIMESTAMP) AS v, CAST(d.FechaEfectiva AS TIMESTAMP) AS e
+    FROM desembolsos d
+    JOIN {operaciones} o ON d.{clave_hechos} = o.{clave_dimension}
+    LEFT JOIN proyectos p ON o.NoProyecto = p.NoProyecto
+)
+-- Como add_years: sin los desembolsos sin fechas o anteriores a la vigencia
+WHERE e >= v
+"""
+
+# Conexión de una versión de los datos; DuckDB no admite consultas concurrentes sobre una misma conexión
+Motor = namedtuple("Motor", ["conexion", "lock"])
+
+# Resultados ya calculados: (id(motor), sql, params) -> (motor, DataFrame)
+MAX_RESULTADOS = 64
+_resultados = {}
+_resultados_lock = threading.Lock()
+
+
+@por_hojas
+def engine(hojas):
+    """Conexión DuckDB con las tablas de ``hojas`` y las vistas de hechos, una por actualización.
+
+    Las claves de las dimensiones deben ser únicas, como en fact_table; la
+    conexión no puede leer ni escribir archivos.
+    """
+    conexion = duckdb.connect()
+    for nombre in ('proyectos', 'operaciones', 'desembolsos'):
+        conexion.register(nombre, getattr(hojas, nombre))
+    for union, vista in VISTAS.items():
+        clave_hechos, clave_dimension = CLAVES[union]
+        operaciones = 'operaciones'
+        if clave_dimension in CLAVES_REPETIBLES:
+            # Como fact_table: la primera operación de cada clave repetida
+            operaciones = f'operaciones_{vista}'
+            conexion.register(operaciones, hojas.operaciones.drop_duplicates(clave_dimension))
+        conexion.execute(_VISTA_HECHOS.format(
+            vista=vista, ano=_ANO, operaciones=operaciones, clave_hechos=clave_hechos, clave_dimension=clave_dimension,
+        ))
+    conexion.execute("SET enable_external_access = false")
+    conexion.execute("SET lock_configuration = true")
+    return Motor(conexion, threading.Lock())
+
+
+def run_query(hojas, sql, params=()):
+    """Resultado de ``sql`` con ``params`` sobre ``hojas``, calculado una vez por actualización.
+
+    El DataFrame es compartido entre sesiones: no debe modificarse en el lugar.
+    """
+    motor = engine(hojas)
+    params = tuple(params)
+    clave = (id(motor), sql, params)
+    entrada = _resultados.get(clave)
+    if entrada is not None and entrada[0] is motor:
+        return entrada[1]
+    with motor.lock, span("sql") as medicion:
+        resultado = motor.conexion.execute(sql, list(params)).df()
+        medicion.filas = len(resultado)
+    with _resultados_lock:
+        if len(_resultados) >= MAX_RESULTADOS:
+            _resultados.pop(next(iter(_resultados)))
+        # Se guarda también el motor para que su id() no se reutilice mientras viva la entrada
+        _resultados[clave] = (motor, resultado)
+    return resultado
+
+
+def _columna(nombre, permitidas):
+    if nombre not in permitidas:
+        raise ValueError(f"Columna desconocida: {nombre!r}; se admiten {permitidas}")
+    return f'"{nombre}"'
+
+
+def aggregate(hojas, claves, eje='Ano', filtros=None, union='IDOperacion', valor='Monto'):
+    """Suma de ``valor`` por ``claves`` y ``eje`` en la vista de hechos de ``union``.
+
+    ``filtros`` es un diccionario columna -> valor o lista de valores; los
+    valores viajan como parámetros de la consulta preparada.
+    """
+    columnas = [_columna(nombre, COLUMNAS_HECHOS) for nombre in list(claves) + [eje]]
+    condiciones, params = [], []
+    for nombre, valores in (filtros or {}).items():
+        valores = list(valores) if isinstance(valores, (list, tuple, set)) else [valores]
+        if not valores:
+            condiciones.append("false")
+            continue
+        condiciones.append(f"{_columna(nombre, COLUMNAS_HECHOS)} IN ({', '.join('?' * len(valores))})")
+        params.extend(valores)
+    sql = (
+        f"SELECT {', '.join(columnas)}, sum({_columna(valor, VALORES)}) AS \"{valor}\" "
+        f"FROM {VISTAS[union]} "
+        + (f"WHERE {' AND '.join(condiciones)} " if condiciones else "")
+        + f"GROUP BY ALL ORDER BY {', '.join(columnas)}"
+    )
+    return run_query(hojas, sql, params)
+
+
+def _parametro(texto):
+    """Un --param como número, booleano o null si lo es; si no, como texto."""
+    try:
+        valor = json.loads(texto)
+    except ValueError:
+        return texto
+    return texto if isinstance(valor, (list, dict)) else valor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta una consulta SQL sobre las hojas de la última instantánea.")
+    parser.add_argument("sql", help=f"consulta; tablas proyectos, operaciones, desembolsos y las vistas {', '.join(VISTAS.values())}")
+    parser.add_argument("--param", action="append", default=[], help="valor de un parámetro ?, en orden")
+    parser.add_argument("--salida", default=None, help="guarda el resultado como CSV")
+    parser.add_argument("--actualizar", action="store_true", help="descarga las hojas en lugar de usar la instantánea")
+    args = parser.parse_args()
+
+    resultado = run_query(load_hojas(refresh=args.actualizar), args.sql, [_parametro(texto) for texto in args.param])
+    if args.salida:
+        resultado.to_csv(args.salida, index=False)
+        print(f"{len(resultado)} filas guardadas en {args.salida}")
+    else:
+        print(resultado.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Reducción de los datos de un gráfico antes de enviarlos al navegador.
+
+Dos etapas, configurables por gráfico con ``Reduccion``:
+
+- LTTB (Largest-Triangle-Three-Buckets) para series temporales largas, que
+  conserva la forma de cada curva dibujada con ``puntos`` puntos;
+- un tope de filas que, si se aplica, se informa con una nota visible.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Cada etapa se omite cuando su parámetro es None
+Reduccion = namedtuple("Reduccion", ["puntos", "max_filas"], defaults=(None, 5000))
+
+
+def _posiciones_lttb(x, y, puntos):
+    """Posiciones que conserva LTTB con ``puntos`` puntos (``x`` ordenado)."""
+    n = len(x)
+    # Los extremos se conservan; el resto se reparte en puntos - 2 cubetas
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(int)
+    elegidos = np.empty(puntos, dtype=int)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(puntos - 2):
+        desde, hasta = bordes[i], bordes[i + 1]
+        # Promedio de la cubeta siguiente como tercer vértice del triángulo
+        siguiente = slice(bordes[i + 1], bordes[i + 2] if i + 2 < len(bordes) else n)
+        x_medio, y_medio = x[siguiente].mean(), y[siguiente].mean()
+        areas = np.abs(
+            (x[anterior] - x_medio) * (y[desde:hasta] - y[anterior])
+            - (x[anterior] - x[desde:hasta]) * (y_medio - y[anterior])
+        )
+        anterior = desde + int(np.argmax(areas))
+        elegidos[i + 1] = anterior
+    return elegidos
+
+
+def lttb(df, x_col, y_cols, puntos):
+    """Submuestreo LTTB de ``df`` (ordenado por ``x_col``) para las series ``y_cols``.
+
+    Cada serie elige sus ``puntos`` puntos y se conservan las filas que
+    eligió alguna, para que ninguna de las curvas dibujadas pierda su forma.
+    """
+    if puntos >= len(df) or puntos < 3:
+        return df
+    x = df[x_col].to_numpy(dtype='float64')
+    elegidos = [_posiciones_lttb(x, df[y_col].to_numpy(dtype='float64'), puntos) for y_col in y_cols]
+    return df.iloc[np.unique(np.concatenate(elegidos))]
+
+
+def reduce_chart_data(df, x_col, y_cols, reduccion):
+    """Aplica las etapas de ``reduccion``; devuelve (datos, nota) con nota None si no se recortó."""
+    if reduccion.puntos is not None:
+        df = lttb(df.sort_values(x_col), x_col, y_cols, reduccion.puntos)
+    nota = None
+    if reduccion.max_filas is not None and len(df) > reduccion.max_filas:
+        nota = f"Se muestran {reduccion.max_filas:,} de {len(df):,} filas"
+        df = df.iloc[:reduccion.max_filas]
+    return df, nota
@@ -0,0 +1,111 @@
+"""Actualización de datos en segundo plano con publicación atómica.
+
+Un hilo del proceso de Streamlit descarga las hojas cada REFRESH_INTERVAL
+segundos (o cuando se pide con ``current(refresh=True)``), precalcula las
+tablas y agregados que usan las páginas y recién entonces publica el
+resultado reemplazando una sola referencia. Las páginas leen la publicación
+vigente sin esperar a la actualización y nunca ven un estado a medio armar.
+"""
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from curves import curves
+from execution import execution
+from fact_table import filtered_facts
+from pivots import country_pivots
+from snapshot import load_hojas, snapshot_age
+
+LOGGER = logging.getLogger(__name__)
+
+# Segundos entre actualizaciones (configurable por entorno)
+REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", 600))
+
+# Datos publicados: las hojas y el momento (epoch) al que corresponden
+Publicacion = namedtuple("Publicacion", ["hojas", "datos_al"])
+
+# (clave, unión, how) de las curvas que muestran las páginas
+CURVAS_PAGINAS = [
+    ('IDEtapa', 'IDOperacion', 'inner'),
+    ('IDEtapa', 'NoOperacion', 'left'),
+    ('IDAreaPrioritaria', 'IDOperacion', 'inner'),
+    ('IDAreaIntervencion', 'NoOperacion', 'left'),
+    ('Pais', 'IDOperacion', 'inner'),
+]
+
+_actual = None
+_inicial_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+_despertar = threading.Event()
+
+
+def _cargar(refresh):
+    hojas = load_hojas(refresh=refresh)
+    edad = snapshot_age()
+    return hojas, time.time() - edad if edad is not None else time.time()
+
+
+def warm(hojas):
+    """Calcula de antemano lo que piden las páginas para ``hojas``."""
+    filtered_facts(hojas, 'IDOperacion', how='inner')
+    filtered_facts(hojas, 'NoOperacion', how='left')
+    for clave, union, how in CURVAS_PAGINAS:
+        for eje in ('Ano', 'Ano_FechaEfectiva'):
+            curves(hojas, clave, eje, union, how=how)
+    execution(hojas)
+    country_pivots(hojas)
+
+
+def _publicar(hojas, datos_al):
+    global _actual
+    # Una asignación de referencia es atómica: los lectores ven la publicación anterior o la nueva
+    _actual = Publicacion(hojas, datos_al)
+
+
+def refresh_once():
+    """Descarga, precalcula y publica; si algo falla se conserva la publicación vigente."""
+    try:
+        hojas, datos_al = _cargar(refresh=True)
+        warm(hojas)
+    except Exception:
+        LOGGER.exception("Falló la actualización en segundo plano; se mantienen los datos publicados")
+        return False
+    _publicar(hojas, datos_al)
+    return True
+
+
+def _bucle():
+    while True:
+        _despertar.wait(REFRESH_INTERVAL)
+        _despertar.clear()
+        refresh_once()
+
+
+def start_refresh_worker():
+    """Inicia el hilo de actualización, una sola vez por proceso."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_bucle, name="actualizacion-datos", daemon=True)
+            _worker.start()
+    return _worker
+
+
+def current(refresh=False):
+    """Publicación vigente; con ``refresh`` se pide una actualización en segundo plano.
+
+    Solo la primera llamada del proceso espera: carga la instantánea (o las
+    hojas, si no hay una vigente) y la publica.
+    """
+    start_refresh_worker()
+    if refresh:
+        _despertar.set()
+    if _actual is None:
+        with _inicial_lock:
+            if _actual is None:
+                hojas, datos_al = _cargar(refresh=False)
+                _publicar(hojas, datos_al)
+    return _actual
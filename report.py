@@ -0,0 +1,109 @@
+"""Reporte del portafolio sin interfaz: curvas de cada etapa y área en un solo libro.
+
+Para cada IDEtapa, IDAreaPrioritaria e IDAreaIntervencion calcula las curvas
+por Ano y por Ano_FechaEfectiva (las mismas que muestran las páginas), dibuja
+sus gráficos en PNG/SVG repartiendo el trabajo en un pool de procesos y
+escribe todas las tablas en un libro de Excel.
+
+Uso: python -m report [--salida reporte] [--formatos png svg] [--procesos N] [--actualizar]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from charts import curve_chart
+from curves import curves
+from snapshot import load_hojas
+
+# clave -> (unión, how) con que la página correspondiente calcula sus curvas
+CLAVES_REPORTE = {
+    'IDEtapa': ('IDOperacion', 'inner'),
+    'IDAreaPrioritaria': ('IDOperacion', 'inner'),
+    'IDAreaIntervencion': ('NoOperacion', 'left'),
+}
+EJES = {'Ano': 'Año', 'Ano_FechaEfectiva': 'Año de Fecha Efectiva'}
+LIBRO = 'reporte_portafolio.xlsx'
+
+
+def _nombre_archivo(texto):
+    return re.sub(r'[^\w.-]+', '_', str(texto))
+
+
+def render_entity(clave, valor, curvas_por_eje, directorio, formatos):
+    """Dibuja los gráficos de una entidad; se ejecuta en un proceso del pool."""
+    rutas = []
+    for eje, curva in curvas_por_eje.items():
+        grafico = curve_chart(curva, eje, f"{clave} {valor}: curva por {EJES[eje]} (montos en millones)")
+        for formato in formatos:
+            ruta = os.path.join(directorio, clave, f"{_nombre_archivo(valor)}_{eje}.{formato}")
+            grafico.save(ruta, format=formato)
+            rutas.append(ruta)
+    return rutas
+
+
+def _tareas(hojas):
+    """(clave, valor, {eje: curva}) para cada entidad de cada clave."""
+    for clave, (union, how) in CLAVES_REPORTE.items():
+        por_eje = {eje: curves(hojas, clave, eje, union, how=how) for eje in EJES}
+        for valor in por_eje['Ano']:
+            yield clave, valor, {eje: curvas[valor] for eje, curvas in por_eje.items() if valor in curvas}
+
+
+def write_workbook(hojas, ruta):
+    """Una hoja por clave y eje, con las curvas de todas las entidades una debajo de otra."""
+    with pd.ExcelWriter(ruta, engine='xlsxwriter') as writer:
+        for clave, (union, how) in CLAVES_REPORTE.items():
+            for eje, nombre_eje in EJES.items():
+                curvas = curves(hojas, clave, eje, union, how=how)
+                tabla = pd.concat(curvas.values(), ignore_index=True) if curvas else pd.DataFrame()
+                # Excel limita los nombres de hoja a 31 caracteres
+                tabla.to_excel(writer, sheet_name=f"{clave} {nombre_eje}"[:31], index=False)
+
+
+def build_report(hojas, directorio, formatos=('png', 'svg'), procesos=None, salida=sys.stderr):
+    """Genera gráficos y libro en ``directorio`` e informa progreso y entidades por segundo."""
+    for clave in CLAVES_REPORTE:
+        os.makedirs(os.path.join(directorio, clave), exist_ok=True)
+    tareas = list(_tareas(hojas))
+    inicio = time.perf_counter()
+    hechas = 0
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(render_entity, clave, valor, curvas, directorio, formatos) for clave, valor, curvas in tareas]
+        for futuro in as_completed(futuros):
+            futuro.result()
+            hechas += 1
+            transcurrido = time.perf_counter() - inicio
+            print(
+                f"\r[{hechas}/{len(tareas)}] {hechas / transcurrido:.1f} entidades/s",
+                end='', file=salida, flush=True,
+            )
+    print(file=salida)
+
+    write_workbook(hojas, os.path.join(directorio, LIBRO))
+    transcurrido = time.perf_counter() - inicio
+    print(
+        f"{len(tareas)} entidades en {transcurrido:.1f}s ({len(tareas) / transcurrido:.1f} entidades/s)",
+        file=salida,
+    )
+    return len(tareas), transcurrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el reporte de curvas de todo el portafolio.")
+    parser.add_argument("--salida", default="reporte", help="directorio de salida")
+    parser.add_argument("--formatos", nargs="+", default=["png", "svg"], choices=["png", "svg"])
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--actualizar", action="store_true", help="descargar las hojas en lugar de usar la instantánea")
+    args = parser.parse_args()
+    hojas = load_hojas(refresh=args.actualizar)
+    build_report(hojas, args.salida, args.formatos, args.procesos)
+    print(f"Reporte guardado en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
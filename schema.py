@@ -0,0 +1,85 @@
+"""Esquema declarado de las tres hojas: columnas, tipos, formatos de fecha y montos.
+
+Se aplica al leer el CSV (``usecols``/``dtype``) para no cargar columnas que
+ninguna página usa ni dejar que pandas infiera tipos y formatos en cada carga.
+"""
+import io
+import logging
+
+import pandas as pd
+
+from metrics import span
+from transforms import parse_amounts
+
+LOGGER = logging.getLogger(__name__)
+
+# Se incrementa al cambiar ESQUEMAS para invalidar instantáneas guardadas con el anterior
+VERSION_ESQUEMA = 1
+
+# Formato exacto con el que Google Sheets publica las fechas (día primero)
+FORMATO_FECHA = '%d/%m/%Y'
+
+ESQUEMAS = {
+    'proyectos': {
+        'tipos': {
+            'NoProyecto': str,
+            'IDAreaPrioritaria': 'category',
+            'IDAreaIntervencion': 'category',
+        },
+        'fechas': [],
+        'montos': [],
+    },
+    'operaciones': {
+        'tipos': {
+            'NoProyecto': str,
+            'NoOperacion': str,
+            'IDEtapa': str,
+            'Alias': str,
+            'Pais': 'category',
+            'FechaVigencia': str,
+            'Estado': 'category',
+            'AporteFONPLATAVigente': 'float64',
+        },
+        'fechas': ['FechaVigencia'],
+        'montos': [],
+    },
+    'desembolsos': {
+        'tipos': {
+            'IDDesembolso': str,
+            'IDOperacion': str,
+            'NoOperacion': str,
+            'Monto': str,
+            'FechaEfectiva': str,
+        },
+        'fechas': ['FechaEfectiva'],
+        'montos': ['Monto'],
+    },
+}
+
+
+def parse_dates(values, formato=FORMATO_FECHA):
+    """Convierte fechas con el formato declarado; solo lo que no encaja se infiere con dayfirst."""
+    fechas = pd.to_datetime(values, format=formato, errors='coerce')
+    pendientes = fechas.isna() & values.notna()
+    if pendientes.any():
+        fechas[pendientes] = pd.to_datetime(values[pendientes], dayfirst=True, errors='coerce')
+    return fechas
+
+
+def read_table(contenido, nombre):
+    """Lee el CSV de la hoja ``nombre`` aplicando su esquema."""
+    esquema = ESQUEMAS[nombre]
+    tipos = esquema['tipos']
+    df = pd.read_csv(io.BytesIO(contenido), usecols=lambda columna: columna in tipos, dtype=tipos)
+
+    for columna in esquema['fechas']:
+        if columna in df:
+            with span("fechas", f"{nombre}.{columna}", filas=len(df)):
+                df[columna] = parse_dates(df[columna])
+    for columna in esquema['montos']:
+        if columna in df:
+            with span("montos", f"{nombre}.{columna}", filas=len(df)):
+                df[columna], fallidos = parse_amounts(df[columna], return_failures=True)
+            if len(fallidos):
+                LOGGER.warning("%s: %d valores de %s no se pudieron convertir", nombre, len(fallidos), columna)
+    return df
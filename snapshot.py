@@ -0,0 +1,137 @@
+"""Instantánea columnar en disco de proyectos, operaciones y desembolsos.
+
+Las tablas se guardan en formato Arrow IPC sin comprimir para poder abrirlas
+con memory-map al arrancar, sin volver a parsear el CSV. Permite además
+arrancar el tablero sin red a partir de la última instantánea.
+
+Uso: python -m snapshot [--directorio DIR]   (descarga y guarda una instantánea)
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from data_loader import Hojas, load_all
+from schema import VERSION_ESQUEMA
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot"))
+# Antigüedad máxima en segundos antes de volver a la red
+SNAPSHOT_MAX_AGE = float(os.environ.get("SNAPSHOT_MAX_AGE", 24 * 3600))
+
+TABLAS = ("proyectos", "operaciones", "desembolsos")
+_METADATOS = "snapshot.json"
+
+# Última instantánea abierta en el proceso: (directorio, creado, Hojas)
+_abierta = None
+_abierta_lock = threading.Lock()
+
+
+def _ruta(directorio, nombre):
+    return os.path.join(directorio, f"{nombre}.arrow")
+
+
+def save_snapshot(hojas, directorio=None):
+    """Guarda las tres tablas; cada archivo se reemplaza de forma atómica."""
+    directorio = directorio or SNAPSHOT_DIR
+    os.makedirs(directorio, exist_ok=True)
+    for nombre in TABLAS:
+        tabla = pa.Table.from_pandas(getattr(hojas, nombre), preserve_index=False)
+        temporal = _ruta(directorio, nombre) + ".tmp"
+        feather.write_feather(tabla, temporal, compression="uncompressed")
+        os.replace(temporal, _ruta(directorio, nombre))
+
+    # Los metadatos se escriben al final: sin ellos la instantánea no se considera válida
+    temporal = os.path.join(directorio, _METADATOS + ".tmp")
+    with open(temporal, "w") as archivo:
+        json.dump({"creado": time.time(), "tablas": list(TABLAS), "esquema": VERSION_ESQUEMA}, archivo)
+    os.replace(temporal, os.path.join(directorio, _METADATOS))
+
+
+def _creado(directorio):
+    try:
+        with open(os.path.join(directorio, _METADATOS)) as archivo:
+            metadatos = json.load(archivo)
+    except (OSError, ValueError):
+        return None
+    # Una instantánea escrita con otro esquema no sirve: se trata como inexistente
+    if metadatos.get("esquema") != VERSION_ESQUEMA:
+        return None
+    return metadatos.get("creado")
+
+
+def snapshot_age(directorio=None):
+    """Segundos desde que se creó la instantánea, o None si no existe."""
+    creado = _creado(directorio or SNAPSHOT_DIR)
+    if creado is None:
+        return None
+    return time.time() - creado
+
+
+def load_snapshot(directorio=None):
+    """Abre la instantánea con memory-map y la devuelve como Hojas.
+
+    Mientras la instantánea en disco no cambie se reutiliza la ya abierta.
+    """
+    global _abierta
+    directorio = directorio or SNAPSHOT_DIR
+    creado = _creado(directorio)
+    with _abierta_lock:
+        if _abierta is not None and _abierta[:2] == (directorio, creado):
+            return _abierta[2]
+        tablas = {}
+        tiempos = {}
+        for nombre in TABLAS:
+            inicio = time.perf_counter()
+            tablas[nombre] = feather.read_table(_ruta(directorio, nombre), memory_map=True).to_pandas(split_blocks=True)
+            tiempos[nombre] = time.perf_counter() - inicio
+        _abierta = (directorio, creado, Hojas(tiempos=tiempos, **tablas))
+        return _abierta[2]
+
+
+def load_hojas(refresh=False, max_age=None, directorio=None):
+    """Carga las hojas desde la instantánea o, si hace falta, desde la red.
+
+    Solo se va a la red cuando se pide ``refresh`` o la instantánea es más
+    antigua que ``max_age``. Si la red falla se sirve la última instantánea
+    aunque esté vencida; si lo que falla es guardar la nueva (disco lleno o de
+    solo lectura), se devuelven igual las hojas descargadas.
+    """
+    if max_age is None:
+        max_age = SNAPSHOT_MAX_AGE
+    edad = snapshot_age(directorio)
+    if not refresh and edad is not None and edad < max_age:
+        return load_snapshot(directorio)
+
+    try:
+        # ttl=0 obliga a revalidar cada hoja aunque siga en la caché del proceso
+        hojas = load_all(ttl=0 if refresh else None)
+    except OSError:
+        if edad is None:
+            raise
+        LOGGER.warning("No se pudieron descargar las hojas; se usa la instantánea de hace %.0f s", edad)
+        return load_snapshot(directorio)
+    try:
+        save_snapshot(hojas, directorio)
+    except OSError:
+        LOGGER.exception("No se pudo guardar la instantánea en %s; se usan las hojas descargadas", directorio or SNAPSHOT_DIR)
+    return hojas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Descarga las hojas y guarda una instantánea columnar.")
+    parser.add_argument("--directorio", default=None, help=f"destino (por defecto {SNAPSHOT_DIR})")
+    args = parser.parse_args()
+    # Sin pasar por load_hojas: aquí un error al guardar debe terminar el comando
+    save_snapshot(load_all(ttl=0), args.directorio)
+    print(f"Instantánea guardada en {args.directorio or SNAPSHOT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Consulta paginada sobre la tabla de hechos: filtro, orden, ventana y columnas.
+
+Todo se resuelve sobre posiciones de fila, sin copiar la tabla: el filtro da
+una máscara, el orden una permutación (memorizada por tabla y columna) y
+solo las filas y columnas de la página visible se materializan.
+"""
+import threading
+import weakref
+
+import numpy as np
+
+# Permutaciones ya calculadas: (id(df), columna, ascendente) -> (referencia débil a df, posiciones)
+MAX_ORDENES = 16
+_ordenes = {}
+_ordenes_lock = threading.Lock()
+
+
+def _orden(df, columna, ascendente):
+    clave = (id(df), columna, ascendente)
+    entrada = _ordenes.get(clave)
+    if entrada is not None and entrada[0]() is df:
+        return entrada[1]
+    posiciones = (
+        df[columna].reset_index(drop=True)
+        .sort_values(ascending=ascendente, na_position='last', kind='stable')
+        .index.to_numpy()
+    )
+    with _ordenes_lock:
+        if len(_ordenes) >= MAX_ORDENES:
+            _ordenes.pop(next(iter(_ordenes)), None)
+        # La caché no mantiene viva la tabla: al liberarse se borra su entrada, antes de que su id() se reutilice
+        _ordenes[clave] = (weakref.ref(df, lambda _, clave=clave: _ordenes.pop(clave, None)), posiciones)
+    return posiciones
+
+
+def select_rows(df, filtro=None, orden=None, ascendente=True):
+    """Posiciones de las filas que pasan ``filtro`` en el orden pedido, o None si son todas en su orden.
+
+    ``filtro`` es (columna, texto): filas cuya columna contiene el texto, sin
+    distinguir mayúsculas.
+    """
+    mascara = None
+    if filtro is not None:
+        columna, texto = filtro
+        mascara = df[columna].astype(str).str.contains(texto, case=False, regex=False, na=False).to_numpy()
+    if orden is not None:
+        posiciones = _orden(df, orden, ascendente)
+        return posiciones if mascara is None else posiciones[mascara[posiciones]]
+    return None if mascara is None else np.flatnonzero(mascara)
+
+
+def take_page(df, posiciones, columnas=None, inicio=0, filas=50):
+    """Filas ``[inicio, inicio + filas)`` de la selección, solo con ``columnas``."""
+    ventana = slice(inicio, inicio + filas)
+    filas_pagina = np.arange(len(df))[ventana] if posiciones is None else posiciones[ventana]
+    indices_columnas = slice(None) if columnas is None else df.columns.get_indexer(columnas)
+    return df.iloc[filas_pagina, indices_columnas]
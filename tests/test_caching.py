@@ -0,0 +1,44 @@
+import threading
+from collections import Counter
+
+import pandas as pd
+
+from caching import por_hojas
+from data_loader import Hojas
+
+
+def _hojas():
+    return Hojas(tiempos={}, proyectos=pd.DataFrame(), operaciones=pd.DataFrame(), desembolsos=pd.DataFrame())
+
+
+def test_un_calculo_lento_no_bloquea_otras_claves():
+    empezado, liberar = threading.Event(), threading.Event()
+    llamadas = Counter()
+    terminados = []
+
+    @por_hojas
+    def calcular(hojas, nombre):
+        llamadas[nombre] += 1
+        if nombre == 'lento':
+            empezado.set()
+            liberar.wait(5)
+            terminados.append(nombre)
+        return nombre
+
+    hojas = _hojas()
+    assert calcular(hojas, 'memorizado') == 'memorizado'
+    lentos = [threading.Thread(target=calcular, args=(hojas, 'lento')) for _ in range(2)]
+    for hilo in lentos:
+        hilo.start()
+    empezado.wait(5)
+    try:
+        # Mientras 'lento' se calcula, lo memorizado y las otras claves responden sin esperar
+        assert calcular(hojas, 'memorizado') == 'memorizado'
+        assert calcular(hojas, 'otro') == 'otro'
+        assert not terminados
+    finally:
+        liberar.set()
+        for hilo in lentos:
+            hilo.join()
+    # Las dos sesiones que pidieron 'lento' comparten un solo cálculo
+    assert llamadas == {'memorizado': 1, 'lento': 1, 'otro': 1}
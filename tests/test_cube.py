@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from cube import IncrementalCube
+from fact_table import add_years, build_fact_table
+from schema import read_table
+
+
+@pytest.fixture(scope="module")
+def tablas():
+    crudas = generar_portafolio(2000)
+    return tuple(read_table(a_csv(df), nombre) for df, nombre in zip(crudas, ("proyectos", "operaciones", "desembolsos")))
+
+
+def _completo(proyectos, operaciones, desembolsos):
+    return IncrementalCube().update(proyectos, operaciones, desembolsos)
+
+
+def test_incremental_coincide_con_reconstruccion(tablas):
+    proyectos, operaciones, desembolsos = tablas
+    incremental = IncrementalCube()
+    incremental.update(proyectos, operaciones, desembolsos.iloc[:1900])
+
+    actual = desembolsos.copy()
+    actual.loc[actual.index[:5], 'Monto'] = actual['Monto'].iloc[:5] * 2
+    actual = actual.drop(actual.index[5:10])
+    cubo = incremental.update(proyectos, operaciones, actual)
+
+    assert incremental.reconstrucciones == 1
+    pd.testing.assert_frame_equal(cubo, _completo(proyectos, operaciones, actual), check_exact=False, rtol=1e-9)
+
+
+def test_ids_duplicados_obligan_a_reconstruir_despues(tablas):
+    proyectos, operaciones, desembolsos = tablas
+    duplicados = desembolsos.copy()
+    duplicados.loc[duplicados.index[1], 'IDDesembolso'] = duplicados['IDDesembolso'].iloc[0]
+
+    incremental = IncrementalCube()
+    incremental.update(proyectos, operaciones, duplicados)
+    cubo = incremental.update(proyectos, operaciones, desembolsos)
+    assert incremental.reconstrucciones == 2
+    pd.testing.assert_frame_equal(cubo, _completo(proyectos, operaciones, desembolsos))
+
+    # Con ids válidos vuelve a actualizarse de forma incremental
+    incremental.update(proyectos, operaciones, desembolsos.iloc[:-3])
+    assert incremental.reconstrucciones == 2
+
+
+def test_la_tabla_de_hechos_solo_se_pide_al_reconstruir(tablas):
+    proyectos, operaciones, desembolsos = tablas
+    pedidas = []
+
+    def hechos(filas):
+        def construir():
+            pedidas.append(len(filas))
+            return add_years(build_fact_table(proyectos, operaciones, filas))
+        return construir
+
+    incremental = IncrementalCube()
+    incremental.update(proyectos, operaciones, desembolsos.iloc[:1900], hechos=hechos(desembolsos.iloc[:1900]))
+    cubo = incremental.update(proyectos, operaciones, desembolsos, hechos=hechos(desembolsos))
+
+    assert pedidas == [1900]
+    pd.testing.assert_frame_equal(cubo, _completo(proyectos, operaciones, desembolsos), check_exact=False, rtol=1e-9)
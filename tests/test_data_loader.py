@@ -0,0 +1,103 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import data_loader
+from benchmarks.bench_carga import DESEMBOLSOS_CSV, OPERACIONES_CSV, PROYECTOS_CSV
+from benchmarks.servidor_local import ServidorLocal
+
+LATENCIA = 0.5
+ARCHIVOS = {
+    "/proyectos.csv": PROYECTOS_CSV,
+    "/operaciones.csv": OPERACIONES_CSV,
+    "/desembolsos.csv": DESEMBOLSOS_CSV,
+}
+
+
+@pytest.fixture(autouse=True)
+def cache_vacia():
+    data_loader.invalidate()
+    yield
+    data_loader.invalidate()
+
+
+def test_load_all_carga_las_hojas_en_paralelo():
+    with ServidorLocal(ARCHIVOS, latencia=LATENCIA) as servidor:
+        urls = {nombre: servidor.url(f"/{nombre}.csv") for nombre in ("proyectos", "operaciones", "desembolsos")}
+        inicio = time.perf_counter()
+        hojas = data_loader.load_all(urls)
+        segundos = time.perf_counter() - inicio
+
+    # En serie serían tres latencias; en paralelo, poco más de una
+    assert segundos < 2 * LATENCIA
+    assert set(hojas.tiempos) == {"proyectos", "operaciones", "desembolsos"}
+    assert all(tiempo >= LATENCIA for tiempo in hojas.tiempos.values())
+    assert len(hojas.desembolsos) == 3
+
+
+def test_cargas_concurrentes_descargan_una_sola_vez(monkeypatch):
+    sesiones = 8
+    llamadas = []
+    df = pd.DataFrame({'Monto': [1.0]})
+
+    def fetch_contado(url, previa, esquema):
+        llamadas.append(url)
+        # Da tiempo a que las demás sesiones lleguen mientras la descarga sigue en curso
+        time.sleep(0.2)
+        return data_loader._Entrada(time.monotonic(), df, None, None, "hash")
+
+    monkeypatch.setattr(data_loader, "_fetch", fetch_contado)
+    barrera = threading.Barrier(sesiones)
+
+    def cargar(_):
+        barrera.wait()
+        return data_loader.load_data("memoria://desembolsos.csv")
+
+    with ThreadPoolExecutor(sesiones) as ejecutor:
+        resultados = list(ejecutor.map(cargar, range(sesiones)))
+
+    assert llamadas == ["memoria://desembolsos.csv"]
+    assert all(resultado is df for resultado in resultados)
+
+
+def test_revalidacion_con_etag_reutiliza_el_dataframe():
+    with ServidorLocal({"/desembolsos.csv": DESEMBOLSOS_CSV}) as servidor:
+        url = servidor.url("/desembolsos.csv")
+        primero = data_loader.load_data(url, ttl=0)
+        segundo = data_loader.load_data(url, ttl=0)
+        assert servidor.respuestas == {200: 1, 304: 1}
+    assert segundo is primero
+
+
+def test_revalidacion_con_contenido_nuevo_vuelve_a_leer():
+    with ServidorLocal({"/desembolsos.csv": DESEMBOLSOS_CSV}) as servidor:
+        url = servidor.url("/desembolsos.csv")
+        primero = data_loader.load_data(url, ttl=0)
+        servidor.actualizar("/desembolsos.csv", DESEMBOLSOS_CSV + b'4,E2,O2,"10,00",01/01/2022\n')
+        segundo = data_loader.load_data(url, ttl=0)
+        assert servidor.respuestas == {200: 2, 304: 0}
+    assert segundo is not primero
+    assert len(segundo) == len(primero) + 1
+
+
+def test_sin_validadores_compara_el_hash_del_contenido():
+    with ServidorLocal({"/desembolsos.csv": DESEMBOLSOS_CSV}, validadores=False) as servidor:
+        url = servidor.url("/desembolsos.csv")
+        primero = data_loader.load_data(url, ttl=0)
+        segundo = data_loader.load_data(url, ttl=0)
+        assert servidor.respuestas == {200: 2, 304: 0}
+    # Mismo contenido: no se vuelve a parsear
+    assert segundo is primero
+
+
+def test_la_cache_distingue_el_esquema():
+    with ServidorLocal({"/desembolsos.csv": DESEMBOLSOS_CSV}) as servidor:
+        url = servidor.url("/desembolsos.csv")
+        crudo = data_loader.load_data(url)
+        tipado = data_loader.load_data(url, esquema="desembolsos")
+        assert data_loader.load_data(url) is crudo
+    assert not pd.api.types.is_numeric_dtype(crudo['Monto'])
+    assert tipado['Monto'].dtype == 'float64'
@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from data_loader import Hojas
+from execution import execution, portfolio_execution
+from schema import read_table
+
+
+@pytest.fixture(scope="module")
+def hojas_sin_desembolsos():
+    crudas = generar_portafolio(2000)
+    tablas = {nombre: read_table(a_csv(df), nombre) for df, nombre in zip(crudas, ("proyectos", "operaciones", "desembolsos"))}
+    # Las tres primeras operaciones se quedan sin desembolsos
+    quitar = tablas['operaciones']['IDEtapa'].iloc[:3].tolist()
+    desembolsos = tablas['desembolsos']
+    tablas['desembolsos'] = desembolsos[~desembolsos['IDOperacion'].isin(quitar)].reset_index(drop=True)
+    return Hojas(tiempos={}, **tablas), quitar
+
+
+@pytest.mark.parametrize("eje", ["Ano", "Ano_FechaEfectiva"])
+def test_operaciones_sin_desembolsos_informan_su_saldo(hojas_sin_desembolsos, eje):
+    hojas, quitar = hojas_sin_desembolsos
+    ejecucion = execution(hojas, eje)
+
+    filas = ejecucion[ejecucion['IDEtapa'].isin(quitar)]
+    assert sorted(filas['IDEtapa']) == sorted(quitar)
+    assert (filas['Monto'] == 0).all()
+    assert (filas['Saldo'] == filas['Aporte']).all()
+
+    portafolio = portfolio_execution(ejecucion, eje=eje)
+    aporte_total = hojas.operaciones['AporteFONPLATAVigente'].sum()
+    assert portafolio['Saldo'].iloc[-1] == pytest.approx(aporte_total - portafolio['Monto'].sum())
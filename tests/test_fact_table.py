@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from data_loader import Hojas
+from fact_table import add_years, build_fact_table
+from query import aggregate
+from schema import read_table
+
+
+@pytest.fixture(scope="module")
+def tablas():
+    crudas = generar_portafolio(2000)
+    return {nombre: read_table(a_csv(df), nombre) for df, nombre in zip(crudas, ("proyectos", "operaciones", "desembolsos"))}
+
+
+def _con_repetida(operaciones, columna):
+    # La segunda operación pasa a tener la clave de la primera
+    repetidas = operaciones.copy()
+    repetidas.loc[repetidas.index[1], columna] = repetidas[columna].iloc[0]
+    return repetidas
+
+
+def test_no_operacion_repetida_usa_la_primera_operacion(tablas, caplog):
+    operaciones = _con_repetida(tablas['operaciones'], 'NoOperacion')
+    repetida = operaciones['NoOperacion'].iloc[0]
+
+    hechos = build_fact_table(tablas['proyectos'], operaciones, tablas['desembolsos'], 'NoOperacion', how='left')
+
+    assert len(hechos) == len(tablas['desembolsos'])
+    assert set(hechos.loc[hechos['NoOperacion'] == repetida, 'IDEtapa']) == {operaciones['IDEtapa'].iloc[0]}
+    assert "NoOperacion repetido en 1 filas" in caplog.text
+
+    # DuckDB resuelve la misma unión igual
+    hojas = Hojas(tiempos={}, proyectos=tablas['proyectos'], operaciones=operaciones, desembolsos=tablas['desembolsos'])
+    sql = aggregate(hojas, ['IDEtapa'], 'Ano', union='NoOperacion')
+    assert sql['Monto'].sum() == pytest.approx(add_years(hechos)['Monto'].sum())
+
+
+def test_id_etapa_repetido_se_rechaza(tablas):
+    operaciones = _con_repetida(tablas['operaciones'], 'IDEtapa')
+    with pytest.raises(ValueError, match="Claves duplicadas en operaciones.IDEtapa"):
+        build_fact_table(tablas['proyectos'], operaciones, tablas['desembolsos'])
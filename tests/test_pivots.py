@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.sintetico import a_csv, generar_portafolio
+from data_loader import Hojas
+from fact_table import filtered_facts
+from pivots import combine_pivots, country_pivots
+from schema import read_table
+
+
+@pytest.fixture(scope="module")
+def hojas():
+    crudas = generar_portafolio(2000)
+    tablas = {nombre: read_table(a_csv(df), nombre) for df, nombre in zip(crudas, ("proyectos", "operaciones", "desembolsos"))}
+    # Las dos primeras operaciones se quedan sin desembolsos
+    quitar = tablas['operaciones']['IDEtapa'].iloc[:2].tolist()
+    desembolsos = tablas['desembolsos']
+    tablas['desembolsos'] = desembolsos[~desembolsos['IDOperacion'].isin(quitar)].reset_index(drop=True)
+    return Hojas(tiempos={}, **tablas)
+
+
+def test_monto_y_porcentaje_tienen_las_mismas_operaciones(hojas):
+    parciales = country_pivots(hojas)
+    monto = combine_pivots(parciales, [], 'Monto')
+    porcentaje = combine_pivots(parciales, [], 'Porcentaje')
+
+    assert monto.totales.index.equals(porcentaje.totales.index)
+    assert set(monto.totales.index) == set(hojas.operaciones['IDEtapa'])
+    hechos = filtered_facts(hojas, 'IDOperacion', how='inner')
+    assert monto.totales.sum() == pytest.approx(hechos['Monto'].sum() / 1_000_000, abs=0.01)
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from reduction import Reduccion, reduce_chart_data
+
+SERIES = ['Monto', 'Monto Acumulado']
+
+
+def test_lttb_conserva_la_forma_de_cada_serie_dibujada():
+    rng = np.random.default_rng(0)
+    curva = pd.DataFrame({'Ano': np.arange(5000), 'Monto': rng.normal(size=5000)})
+    curva['Monto Acumulado'] = curva['Monto'].cumsum()
+
+    reducida, nota = reduce_chart_data(curva, 'Ano', SERIES, Reduccion(puntos=100, max_filas=None))
+
+    assert nota is None
+    assert len(reducida) <= 2 * 100
+    assert reducida['Ano'].is_monotonic_increasing
+    # Los extremos del acumulado sobreviven aunque Monto no los elija
+    assert reducida['Monto Acumulado'].max() == curva['Monto Acumulado'].max()
+    assert reducida['Monto Acumulado'].min() == curva['Monto Acumulado'].min()
+    solo_monto, _ = reduce_chart_data(curva, 'Ano', ['Monto'], Reduccion(puntos=100, max_filas=None))
+    assert solo_monto['Monto Acumulado'].max() < curva['Monto Acumulado'].max()
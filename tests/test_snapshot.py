@@ -0,0 +1,20 @@
+import pandas as pd
+
+import snapshot
+from data_loader import Hojas
+
+
+def test_un_error_al_guardar_no_impide_usar_las_hojas_descargadas(tmp_path, monkeypatch):
+    hojas = Hojas(
+        tiempos={},
+        proyectos=pd.DataFrame({'NoProyecto': ['P1']}),
+        operaciones=pd.DataFrame({'IDEtapa': ['E1']}),
+        desembolsos=pd.DataFrame({'Monto': [1.0]}),
+    )
+    monkeypatch.setattr(snapshot, "load_all", lambda ttl=None: hojas)
+    # Un archivo donde debería estar el directorio: os.makedirs falla con OSError
+    ocupado = tmp_path / "instantanea"
+    ocupado.write_text("")
+
+    assert snapshot.load_hojas(refresh=True, directorio=str(ocupado)) is hojas
+    assert snapshot.snapshot_age(str(ocupado)) is None
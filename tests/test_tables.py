@@ -0,0 +1,17 @@
+import gc
+
+import pandas as pd
+
+import tables
+
+
+def test_el_orden_memorizado_no_retiene_la_tabla():
+    df = pd.DataFrame({'Monto': [3.0, 1.0, 2.0]})
+    assert tables.select_rows(df, orden='Monto').tolist() == [1, 2, 0]
+    assert tables.select_rows(df, orden='Monto') is tables.select_rows(df, orden='Monto')
+
+    clave = (id(df), 'Monto', True)
+    assert clave in tables._ordenes
+    del df
+    gc.collect()
+    assert clave not in tables._ordenes
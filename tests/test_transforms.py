@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from transforms import convert_to_float, parse_amounts
+
+
+@pytest.mark.parametrize("dtype", ["str", object])
+def test_parse_amounts_coincide_con_convert_to_float(dtype):
+    montos = pd.Series(["1.234.567,89", "0,5", "-3,25", " 12,5", "1e3", "inf", "s/d", "", "1_000"], dtype=dtype)
+    resultado, fallidos = parse_amounts(montos, return_failures=True)
+    pd.testing.assert_series_equal(resultado, montos.apply(convert_to_float), check_exact=True)
+    assert list(fallidos) == [6, 7]
+
+
+def test_parse_amounts_conserva_numeros_y_nulos():
+    montos = pd.Series(["1.000,5", 7.5, 3, None, np.nan])
+    resultado, fallidos = parse_amounts(montos, return_failures=True)
+    assert resultado.tolist()[:3] == [1000.5, 7.5, 3.0]
+    assert resultado.iloc[3:].isna().all()
+    assert len(fallidos) == 0
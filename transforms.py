@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Función para convertir el monto a un número flotante
+def convert_to_float(monto_str):
+    try:
+        monto_str = monto_str.replace('.', '').replace(',', '.')
+        return float(monto_str)
+    except ValueError:
+        return np.nan
+
+
+# Texto que el cast de Arrow convierte igual que float(); el resto pasa por float()
+_NUMERO_SIMPLE = r'^-?[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?$'
+
+
+def _parse_text(textos):
+    """Montos de un arreglo Arrow de texto: (números, posiciones pendientes, texto limpio).
+
+    El cast de Arrow redondea igual que float(). Si algún texto no se puede
+    convertir, se convierten solo los que tienen la forma ``-123.45`` y las
+    demás posiciones no nulas quedan pendientes para float().
+    """
+    limpio = pc.replace_substring(pc.replace_substring(textos, '.', ''), ',', '.')
+    try:
+        numeros = pc.cast(limpio, pa.float64())
+        pendientes = np.empty(0, dtype=np.intp)
+    except pa.ArrowInvalid:
+        simples = pc.match_substring_regex(limpio, _NUMERO_SIMPLE).fill_null(False)
+        numeros = pc.cast(pc.if_else(simples, limpio, pa.scalar(None, pa.string())), pa.float64())
+        pendientes = np.flatnonzero(
+            ~simples.to_numpy(zero_copy_only=False) & limpio.is_valid().to_numpy(zero_copy_only=False)
+        )
+    # Los nulos quedan en NaN
+    return numeros.to_numpy(zero_copy_only=False).copy(), pendientes, limpio
+
+
+def _texto_arrow(dtype):
+    """Si ``dtype`` es texto guardado en Arrow (el "str" de pandas 3 o un ArrowDtype de texto)."""
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage == 'pyarrow'
+    if isinstance(dtype, pd.ArrowDtype):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def parse_amounts(values, return_failures=False):
+    """Versión vectorizada de convert_to_float para montos como "1.234.567,89".
+
+    Da el mismo resultado que aplicar convert_to_float fila a fila: lo que no
+    se puede convertir queda en NaN. Los valores que ya son numéricos se
+    conservan tal cual. Con ``return_failures`` devuelve además el índice de
+    las filas que no se pudieron convertir.
+
+    Los reemplazos y la conversión se hacen en pyarrow; solo el texto con otra
+    forma (espacios, "inf", inválidos) se convierte con float() uno a uno. Una
+    columna de texto respaldada por Arrow entra sin pasar por objetos de Python.
+    """
+    serie = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        resultado = serie.astype('float64')
+        return (resultado, serie.index[:0]) if return_failures else resultado
+
+    no_texto = np.zeros(len(serie), dtype=bool)
+    if _texto_arrow(serie.dtype):
+        textos = pa.array(serie.array)
+    else:
+        valores = serie.to_numpy(dtype=object)
+        try:
+            textos = pa.array(valores, type=pa.string(), from_pandas=True)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            # Texto mezclado con números ya convertidos: cada grupo por su lado
+            no_texto = np.fromiter((not isinstance(valor, str) for valor in valores), dtype=bool, count=len(valores))
+            textos = pa.array(np.where(no_texto, None, valores), type=pa.string())
+
+    numeros, pendientes, limpio = _parse_text(textos)
+    posiciones_fallidas = []
+    for posicion in pendientes:
+        try:
+            numeros[posicion] = float(limpio[posicion].as_py())
+        except ValueError:
+            posiciones_fallidas.append(posicion)
+    for posicion in np.flatnonzero(no_texto):
+        if pd.isna(valores[posicion]):
+            continue
+        try:
+            numeros[posicion] = float(valores[posicion])
+        except (ValueError, TypeError):
+            posiciones_fallidas.append(posicion)
+
+    resultado = pd.Series(numeros, index=serie.index, name=serie.name)
+    fallidos = serie.index[sorted(posiciones_fallidas)]
+    return (resultado, fallidos) if return_failures else resultado
+
+
+# Meses de cada tamaño de período para periods_since
+PERIODOS = {'Ano': 12, 'Semestre': 6, 'Trimestre': 3}
+
+
+def periods_since(inicio, fin, periodo='Ano'):
+    """Períodos completos (años, semestres o trimestres) entre ``inicio`` y ``fin``.
+
+    Cuenta aniversarios reales de calendario, igual que
+    ``relativedelta(fin, inicio)``: un aniversario del 29/02 o del 31 cae el
+    último día del mes cuando ese día no existe. Devuelve -1 si ``fin`` es
+    anterior a ``inicio`` y NaN si falta alguna fecha.
+    """
+    meses_periodo = PERIODOS[periodo]
+    meses = (fin.dt.year - inicio.dt.year) * 12 + (fin.dt.month - inicio.dt.month)
+    # El aniversario del mes de ``fin``, recortado al último día si el mes es más corto
+    dia_aniversario = inicio.dt.day.where(inicio.dt.day < fin.dt.days_in_month, fin.dt.days_in_month)
+    hora_inicio = inicio - inicio.dt.normalize()
+    hora_fin = fin - fin.dt.normalize()
+    antes_del_aniversario = (dia_aniversario > fin.dt.day) | ((dia_aniversario == fin.dt.day) & (hora_inicio > hora_fin))
+    meses = meses - antes_del_aniversario.astype(int)
+
+    periodos = (meses // meses_periodo).astype('float64')
+    periodos[fin < inicio] = -1
+    periodos[inicio.isna() | fin.isna()] = np.nan
+    return periodos
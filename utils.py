@@ -14,9 +14,21 @@
 
 import inspect
 import textwrap
+import time
 
+import pandas as pd
 import streamlit as st
 
+import metrics
+import refresh
+from export import FORMATOS, cached_export, export_bytes
+from pivots import densify
+from tables import select_rows, take_page
+
+# Con st.fragment, interactuar con un widget de la función solo vuelve a ejecutar
+# esa función y no la página entera (antes de 1.37 se llamaba experimental_fragment)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda funcion: funcion)
+
 
 def show_code(demo):
     """Showing the code of the demo."""
@@ -26,3 +38,93 @@ def show_code(demo):
         st.markdown("## Code")
         sourcelines, _ = inspect.getsourcelines(demo)
         st.code(textwrap.dedent("".join(sourcelines[1:])))
+
+
+def show_pivot(pivote, key, filas_por_pagina=50):
+    """Muestra un pivots.Pivote densificando solo la página de IDEtapa visible."""
+    total_filas = len(pivote.totales)
+    paginas = max((total_filas - 1) // filas_por_pagina + 1, 1)
+    pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, key=key)
+    inicio = (pagina - 1) * filas_por_pagina
+    st.dataframe(densify(pivote, inicio, filas_por_pagina))
+    st.caption(f"Filas {min(inicio + 1, total_filas)}–{min(inicio + filas_por_pagina, total_filas)} de {total_filas}")
+
+
+@fragment
+def show_table(df, key, filas_por_pagina=50):
+    """Muestra ``df`` paginada; filtro, orden y columnas se resuelven en el servidor.
+
+    Solo la página visible se envía al navegador, y como fragmento cambiar de
+    página o de filtro no vuelve a ejecutar el resto de la página.
+    """
+    todas = list(df.columns)
+    columnas = st.multiselect("Columnas", todas, default=todas, key=f"{key}_columnas")
+    filtro_col, texto_col, orden_col, sentido_col = st.columns([2, 2, 2, 1])
+    filtro = filtro_col.selectbox("Filtrar por", [None] + todas, format_func=lambda c: c or "—", key=f"{key}_filtro")
+    texto = texto_col.text_input("Contiene", key=f"{key}_texto")
+    orden = orden_col.selectbox("Ordenar por", [None] + todas, format_func=lambda c: c or "—", key=f"{key}_orden")
+    descendente = sentido_col.checkbox("Desc.", key=f"{key}_desc")
+
+    posiciones = select_rows(df, (filtro, texto) if filtro and texto else None, orden, not descendente)
+    total_filas = len(df) if posiciones is None else len(posiciones)
+    paginas = max((total_filas - 1) // filas_por_pagina + 1, 1)
+    pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, key=f"{key}_pagina")
+    inicio = (pagina - 1) * filas_por_pagina
+    st.dataframe(take_page(df, posiciones, columnas, inicio, filas_por_pagina))
+    st.caption(f"Filas {min(inicio + 1, total_filas)}–{min(inicio + filas_por_pagina, total_filas)} de {total_filas}")
+
+
+def show_downloads(df, nombre_archivo, key):
+    """Botones de descarga de ``df``; el archivo se genera solo al pedirlo y queda en caché."""
+    formato_col, boton_col = st.columns([1, 3])
+    formato = formato_col.selectbox("Formato", list(FORMATOS), key=f"{key}_formato", label_visibility="collapsed")
+    extension, mime = FORMATOS[formato]
+    contenido = cached_export(df, formato)
+    if contenido is None and boton_col.button(f"Preparar {extension.upper()}", key=f"{key}_preparar"):
+        contenido = export_bytes(df, formato)
+    if contenido is not None:
+        boton_col.download_button(
+            label=f"Descargar {extension.upper()}",
+            data=contenido,
+            file_name=f"{nombre_archivo}.{extension}",
+            mime=mime,
+            key=f"{key}_descargar",
+        )
+
+
+def show_diagnostics():
+    """Panel opcional en la barra lateral con los tiempos de cada etapa.
+
+    Muestra las etapas ejecutadas desde el último panel (este rerun) y los
+    acumulados del proceso, con descarga en JSON y formato Prometheus. Se
+    llama al final de la página para incluir todas sus etapas.
+    """
+    metrics.start_metrics_server()
+    spans = metrics.run_spans()
+    if st.sidebar.checkbox("Diagnóstico", key="diagnostico"):
+        st.sidebar.caption(f"Este rerun: {sum(s.segundos for s in spans):.3f}s en {len(spans)} etapas")
+        st.sidebar.dataframe(pd.DataFrame(
+            [(s.etapa, s.detalle, round(s.segundos * 1000, 1), s.filas) for s in spans],
+            columns=["Etapa", "Detalle", "ms", "Filas"],
+        ))
+        acumulado = pd.DataFrame(
+            [{"Etapa": etapa, "Detalle": detalle, **valores} for (etapa, detalle), valores in metrics.snapshot().items()]
+        )
+        st.sidebar.write("Acumulado del proceso", acumulado)
+        st.sidebar.download_button("Métricas JSON", metrics.metrics_json(), "metricas.json", "application/json")
+        st.sidebar.download_button("Métricas Prometheus", metrics.metrics_prometheus(), "metricas.prom", "text/plain")
+    metrics.reset_run()
+
+
+def load_current():
+    """Hojas de la publicación vigente, con el botón de actualización y la fecha de los datos.
+
+    La actualización corre en segundo plano: la página sigue con los datos
+    publicados y los nuevos aparecen en el próximo rerun después de publicarse.
+    """
+    pedido = st.sidebar.button('Actualizar datos')
+    publicacion = refresh.current(refresh=pedido)
+    st.sidebar.caption(f"Datos al {time.strftime('%d/%m/%Y %H:%M', time.localtime(publicacion.datos_al))}")
+    if pedido:
+        st.sidebar.caption("Actualización en curso; los datos nuevos se verán al terminar.")
+    return publicacion.hojas